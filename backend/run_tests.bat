@@ -1,6 +1,6 @@
 @echo off
 echo Running tests with coverage...
-pytest --cov=src --cov-report=html --cov-report=term-missing
+pytest -n auto --dist=loadfile --cov=src --cov-report=html --cov-report=term-missing
 echo.
 echo HTML coverage report generated in htmlcov/index.html
 pause 
\ No newline at end of file
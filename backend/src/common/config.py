@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import sys
@@ -40,9 +41,11 @@ class Settings(BaseSettings):
     mysql_enabled: bool = Field(default=False, description="Whether to use MySQL for document storage")
     
     # LLM settings
-    generator: str = Field(default="ollama", description="Generator to use")
+    generator: str = Field(default="ollama", description="Generator backend to use: 'ollama', 'vllm' or 'llamacpp'")
     use_ollama: bool = Field(default=True, description="Use Ollama for LLM")
     ollama_api_url: str = Field(default="http://ollama:11434", description="Ollama API URL")
+    vllm_api_url: str = Field(default="http://vllm:8000", description="vLLM OpenAI-compatible API URL")
+    llamacpp_api_url: str = Field(default="http://llamacpp:8080", description="llama.cpp server OpenAI-compatible API URL")
     default_model: str = Field(
         default=OllamaModel.DEEPSEEK_7B.value, 
         description="Default Ollama model to use for inference"
@@ -52,6 +55,12 @@ class Settings(BaseSettings):
         default=["deepseek-r1:1.5b", "deepseek-r1:7b"],
         description="Ollama models to pull during build"
     )
+    ollama_quant: Optional[str] = Field(
+        default=None,
+        description="Quantization of the Ollama models (e.g. 'q4_K_M', 'q8_0'); also applied when pulling them"
+    )
+    ollama_num_ctx: int = Field(default=4096, description="Ollama context window size (KV cache length)")
+    ollama_num_batch: int = Field(default=512, description="Ollama prompt processing batch size")
     
     # Generation parameters for LLM
     generation_kwargs: Dict[str, Any] = Field(
@@ -71,6 +80,7 @@ class Settings(BaseSettings):
     # Application settings
     index_on_startup: bool = Field(default=True, description="Always index files on startup")
     pipelines_from_yaml: bool = Field(default=False, description="Load pipelines from YAML files")
+    app_env: str = Field(default="production", description="Deployment environment ('development' or 'production')")
     
     # Logging settings
     tokenizers_parallelism: bool = Field(default=False, description="Use tokenizers parallelism")
@@ -81,12 +91,27 @@ class Settings(BaseSettings):
     metrics_enabled: bool = Field(default=True, description="Enable Prometheus metrics")
     prometheus_exporter: bool = Field(default=True, description="Enable Prometheus exporter for FastAPI")
     metrics_service_name: str = Field(default="wrag-app", description="Service name for metrics")
+    metrics_component_allowlist: List[str] = Field(
+        default=[
+            "SentenceTransformersTextEmbedder",
+            "SentenceTransformersDocumentEmbedder",
+            "ElasticsearchBM25Retriever",
+            "QdrantEmbeddingRetriever",
+            "OllamaGenerator",
+            "VLLMGenerator",
+            "DocumentWriter",
+            "MySQLDocumentWriter",
+            "MySQLSourceDocumentWriter",
+        ],
+        description="Pipeline component class names to instrument with metrics (empty list instruments all)"
+    )
     
     # Tracing settings
     tracing_enabled: bool = Field(default=False, description="Enable OpenTelemetry tracing")
     jaeger_host: str = Field(default="jaeger", description="Jaeger host")
     jaeger_port: int = Field(default=6831, description="Jaeger port")
-    tracing_content_enabled: bool = Field(default=True, description="Enable content tracing for Haystack")
+    tracing_content_enabled: bool = Field(default=False, description="Enable content tracing for Haystack (development only)")
+    tracing_sample_ratio: float = Field(default=0.01, ge=0.0, le=1.0, description="Ratio of new traces to sample")
     
     # Path settings
     pipelines_dir: Path = Field(
@@ -113,6 +138,14 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid log level. Must be one of: {', '.join(valid_levels)}")
         return upper_v
         
+    @field_validator('generator')
+    @classmethod
+    def validate_generator(cls, v: str) -> str:
+        valid_generators = ['ollama', 'vllm', 'llamacpp']
+        if v not in valid_generators:
+            raise ValueError(f"Invalid generator. Must be one of: {', '.join(valid_generators)}")
+        return v
+        
     @field_validator('default_model')
     @classmethod
     def validate_default_model(cls, v: str) -> str:
@@ -184,7 +217,12 @@ def yaml_to_env_vars(yaml_config: Dict[str, Any]) -> None:
         "llm.generator": "GENERATOR",
         "llm.use_ollama": "USE_OLLAMA",
         "llm.ollama_api_url": "OLLAMA_API_URL",
+        "llm.vllm_api_url": "VLLM_API_URL",
+        "llm.llamacpp_api_url": "LLAMACPP_API_URL",
         "llm.default_model": "DEFAULT_MODEL",
+        "llm.ollama_quant": "OLLAMA_QUANT",
+        "llm.ollama_num_ctx": "OLLAMA_NUM_CTX",
+        "llm.ollama_num_batch": "OLLAMA_NUM_BATCH",
         "embedding.model": "EMBEDDING_MODEL",
         "embedding.dim": "EMBEDDING_DIM",
         "document.split_by": "SPLIT_BY",
@@ -192,16 +230,19 @@ def yaml_to_env_vars(yaml_config: Dict[str, Any]) -> None:
         "document.split_overlap": "SPLIT_OVERLAP",
         "app.index_on_startup": "INDEX_ON_STARTUP",
         "app.pipelines_from_yaml": "PIPELINES_FROM_YAML",
+        "app.environment": "APP_ENV",
         "logging.level": "LOG_LEVEL",
         "logging.wrag_level": "WRAG_LOG_LEVEL",
         "logging.tokenizers_parallelism": "TOKENIZERS_PARALLELISM",
         "metrics.enabled": "METRICS_ENABLED",
         "metrics.prometheus_exporter": "PROMETHEUS_EXPORTER",
         "metrics.service_name": "METRICS_SERVICE_NAME",
+        "metrics.component_allowlist": "METRICS_COMPONENT_ALLOWLIST",
         "tracing.enabled": "TRACING_ENABLED",
         "tracing.jaeger_host": "JAEGER_HOST",
         "tracing.jaeger_port": "JAEGER_PORT",
         "tracing.content_enabled": "TRACING_CONTENT_ENABLED",
+        "tracing.sample_ratio": "TRACING_SAMPLE_RATIO",
     }
     
     # Set environment variables from nested YAML config
@@ -222,6 +263,9 @@ def yaml_to_env_vars(yaml_config: Dict[str, Any]) -> None:
             # Convert boolean and other types to string
             if isinstance(value, bool):
                 value = str(value).lower()
+            elif isinstance(value, (list, dict)):
+                # pydantic-settings parses complex fields from JSON
+                value = json.dumps(value)
             elif not isinstance(value, str):
                 value = str(value)
                 
@@ -250,6 +294,12 @@ def load_settings():
             settings_obj.generation_kwargs = yaml_config['llm']['generation_kwargs']
             print(f"Loaded generation_kwargs from config: {settings_obj.generation_kwargs}")
         
+        # The model list is read directly rather than through an environment
+        # variable, since OLLAMA_MODELS is Ollama's own model directory setting
+        if 'llm' in yaml_config and 'ollama_models' in yaml_config['llm']:
+            models = yaml_config['llm']['ollama_models']
+            settings_obj.ollama_models = [models] if isinstance(models, str) else models
+        
         return settings_obj
     except ValidationError as e:
         print("Error: Failed to load configuration settings.", file=sys.stderr)
@@ -16,7 +16,7 @@ from common.models import FilesUploadResponse, FilesListResponse
 from common.document_store import initialize_document_store, get_qdrant_store
 from common.config import settings
 from indexing.service import IndexingService
-from utils.tracing import instrument_fastapi, patch_haystack_tracing
+from utils.tracing import instrument_fastapi
 from utils.metrics import instrument_fastapi_with_metrics, setup_metrics, create_counter, create_histogram
 
 
@@ -58,8 +58,6 @@ app.add_middleware(
 # Add OpenTelemetry tracing if enabled
 if settings.tracing_enabled:
     instrument_fastapi(app, "indexing_service")
-    # Also ensure Haystack tracing integration is patched
-    patch_haystack_tracing()
 
 # Add Prometheus metrics if enabled
 if hasattr(settings, 'metrics_enabled') and settings.metrics_enabled:
@@ -4,9 +4,11 @@ Query Pipeline Builder Module
 This module builds the query pipeline programmatically instead of using YAML
 to avoid import and configuration issues.
 """
+import logging
+import re
+
 from haystack import Pipeline
 from haystack.components.builders.answer_builder import AnswerBuilder
-from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack.components.embedders.sentence_transformers_text_embedder import SentenceTransformersTextEmbedder
 from haystack.components.joiners.document_joiner import DocumentJoiner
 
@@ -18,10 +20,48 @@ from haystack_integrations.components.retrievers.qdrant import QdrantEmbeddingRe
 from haystack_integrations.components.generators.ollama import OllamaGenerator
 
 from common.config import settings
+from query.prompt_builder import FastPromptBuilder
+from query.vllm_generator import VLLMGenerator
 from common.document_store import initialize_document_store, get_qdrant_store
 from utils.tracing import trace_pipeline_creation
 from utils.metrics import patch_pipeline_components
 
+logger = logging.getLogger(__name__)
+
+# Ollama publishes quantized builds under a different tag than the default one,
+# e.g. 'deepseek-r1:7b' is quantized as 'deepseek-r1:7b-qwen-distill-q4_K_M'
+OLLAMA_QUANT_BASES = {
+    "deepseek-r1:1.5b": "deepseek-r1:1.5b-qwen-distill",
+    "deepseek-r1:7b": "deepseek-r1:7b-qwen-distill",
+}
+
+# Trailing quantization suffix of an Ollama tag (e.g. '-q8_0', '-q4_K_M', '-fp16')
+_QUANT_SUFFIX = re.compile(r"-(q\d\w*|fp16)$")
+
+def resolve_ollama_model(model: str, quant: str = None) -> str:
+    """
+    Resolve the Ollama tag of a model at the given quantization.
+    
+    Any quantization suffix already on the model is replaced, so resolving is
+    idempotent. Models without a known quantized tag are returned unchanged;
+    set `default_model` to the full tag to use a quantized build of those.
+    
+    Args:
+        model (str): Ollama model name, optionally with a tag (e.g. 'deepseek-r1:7b')
+        quant (str, optional): Quantization (e.g. 'q4_K_M'). If None, the model is returned unchanged.
+    
+    Returns:
+        str: The Ollama tag of the quantized model
+    """
+    if not quant:
+        return model
+    base = _QUANT_SUFFIX.sub("", model)
+    base = OLLAMA_QUANT_BASES.get(base, base)
+    if base not in OLLAMA_QUANT_BASES.values():
+        logger.warning(f"No known quantized tag for Ollama model {model}; using it unchanged")
+        return model
+    return f"{base}-{quant}"
+
 @trace_pipeline_creation(service_name="query_service")
 def create_query_pipeline(model: str = None):
     """
@@ -33,9 +73,6 @@ def create_query_pipeline(model: str = None):
     Returns:
         Pipeline: The configured Haystack pipeline
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     # Initialize pipeline
     pipeline = Pipeline()
     
@@ -72,32 +109,47 @@ def create_query_pipeline(model: str = None):
         top_k=5
     )
     
-    # 6. Create prompt builder
-    prompt_builder = PromptBuilder(
-        template="""
-        Given the following context, answer the question.
-        Context:
-        {% for document in documents %}
-            {{ document.content }}
-        {% endfor %}
-        Question: {{query}}
-        Answer:
-        """
-    )
+    # 6. Create prompt builder specialized for the merger's top_k
+    prompt_builder = FastPromptBuilder(top_k=5)
     
     # 7. Create LLM generator
     # Use the provided model if specified, otherwise use the default from settings
     llm_model = model if model else settings.default_model
-    logger.info(f"Using LLM model: {llm_model}")
     
-    # Use generation kwargs from config settings
-    logger.info(f"Using generation kwargs from config: {settings.generation_kwargs}")
-    
-    llm = OllamaGenerator(
-        model=llm_model,
-        url=settings.ollama_api_url,
-        generation_kwargs=settings.generation_kwargs
-    )
+    if settings.generator in ("vllm", "llamacpp"):
+        # OpenAI-compatible server (vLLM or llama.cpp's llama-server)
+        server_url = settings.vllm_api_url if settings.generator == "vllm" else settings.llamacpp_api_url
+        logger.info(f"Using LLM model: {llm_model} served by {settings.generator} at {server_url}")
+        
+        # Translate Ollama-style generation kwargs to the OpenAI completions API
+        generation_kwargs = {k: v for k, v in settings.generation_kwargs.items() if k != "num_predict"}
+        if "num_predict" in settings.generation_kwargs:
+            generation_kwargs["max_tokens"] = settings.generation_kwargs["num_predict"]
+        logger.info(f"Using generation kwargs from config: {generation_kwargs}")
+        
+        llm = VLLMGenerator(
+            model=llm_model,
+            url=server_url,
+            generation_kwargs=generation_kwargs
+        )
+    else:
+        llm_model = resolve_ollama_model(llm_model, settings.ollama_quant)
+        logger.info(f"Using LLM model: {llm_model}")
+        
+        # Use generation kwargs from config settings; OllamaGenerator forwards them as
+        # Ollama 'options', so context window and batch size are tuned here as well
+        generation_kwargs = {
+            "num_ctx": settings.ollama_num_ctx,
+            "num_batch": settings.ollama_num_batch,
+            **settings.generation_kwargs
+        }
+        logger.info(f"Using generation kwargs from config: {generation_kwargs}")
+        
+        llm = OllamaGenerator(
+            model=llm_model,
+            url=settings.ollama_api_url,
+            generation_kwargs=generation_kwargs
+        )
     
     # 8. Create answer builder
     answer_builder = AnswerBuilder()
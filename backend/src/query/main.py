@@ -4,19 +4,21 @@ import sys
 from contextlib import asynccontextmanager
 import json
 import logging
+import time
 from typing import List
-import uuid
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.responses import JSONResponse
+from opentelemetry import trace
 
 from common.api_utils import create_api
 from common.models import SearchQuery, QueryResultsResponse
 from common.document_store import initialize_document_store
-from common.config import settings, OllamaModel
+from common.config import settings
 from query.service import QueryService
+from pipelines.query_pipeline import resolve_ollama_model
 from query.serializer import serialize_query_result
-from utils.tracing import instrument_fastapi, patch_haystack_tracing
+from utils.tracing import instrument_fastapi
 from utils.metrics import instrument_fastapi_with_metrics, setup_metrics, create_counter, create_histogram
 
 
@@ -39,6 +41,9 @@ query_service = QueryService(document_store)
 async def lifespan(app: FastAPI):
     logger.info("Starting up...")
 
+    # Load models now so the first search does not pay the loading cost
+    query_service.warm_up()
+
     yield
     # Shutdown
     logger.info("Shutting down")
@@ -49,11 +54,12 @@ app = create_api(title="RAG Query Service", lifespan=lifespan)
 # Add OpenTelemetry tracing if enabled
 if settings.tracing_enabled:
     instrument_fastapi(app, "query_service")
-    # Also ensure Haystack tracing integration is patched
-    patch_haystack_tracing()
+
+# Resolve the metrics flag once instead of on every request
+_METRICS_ENABLED = getattr(settings, 'metrics_enabled', False)
 
 # Add Prometheus metrics if enabled
-if hasattr(settings, 'metrics_enabled') and settings.metrics_enabled:
+if _METRICS_ENABLED:
     instrument_fastapi_with_metrics(app, "query_service")
     # Create some basic metrics
     search_counter = create_counter(
@@ -100,8 +106,7 @@ async def search(
     """
     try:
         # Start timing the search operation for metrics
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Process the search request
         results = service.search(
@@ -111,13 +116,13 @@ async def search(
         )
         
         # Record metrics if enabled
-        if hasattr(settings, 'metrics_enabled') and settings.metrics_enabled:
+        if _METRICS_ENABLED:
             if search_counter:
                 search_counter.labels(query_type="search").inc()
             
             if search_latency:
                 # Calculate latency in milliseconds
-                latency_ms = (time.time() - start_time) * 1000
+                latency_ms = (time.perf_counter_ns() - start_time) / 1e6
                 search_latency.labels(query_type="search").observe(latency_ms)
         
         # Process and return the results
@@ -136,8 +141,6 @@ async def health_check():
     # Generate an explicit trace for testing
     if settings.tracing_enabled:
         try:
-            from opentelemetry import trace
-            
             # Get current tracer
             tracer = trace.get_tracer("query_service")
             logger.info(f"Got tracer: {tracer}")
@@ -149,7 +152,6 @@ async def health_check():
                 span.add_event("Health check started")
                 
                 # Simulate some work
-                import time
                 time.sleep(0.1)
                 
                 # Create a nested span
@@ -189,8 +191,16 @@ async def get_available_models():
     Returns:
         List[dict]: A list of model dictionaries with id and name keys
     """
-    models = [{"id": model.value, "name": model.value} 
-              for model in OllamaModel]
+    if settings.generator != "ollama":
+        # vLLM and llama.cpp serve the single model they were started with
+        names = [settings.default_model]
+    else:
+        # Only list models that were pulled during the build, at the configured quantization
+        names = dict.fromkeys(
+            resolve_ollama_model(model, settings.ollama_quant)
+            for model in [settings.default_model, *settings.ollama_models]
+        )
+    models = [{"id": name, "name": name} for name in names]
     
     return {"models": models}
 
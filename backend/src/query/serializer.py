@@ -1,5 +1,5 @@
 import os
-import uuid
+import secrets
 from typing import List
 
 from haystack.dataclasses import GeneratedAnswer, Document
@@ -13,19 +13,21 @@ from common.models import (
 
 
 def serialize_query_result(query: str, answer: GeneratedAnswer) -> QueryResultsResponse:
-    query_id = uuid.uuid4().hex[:8]
+    query_id = secrets.token_hex(4)
     
-    result = ResultModel(
+    # The response models are built from trusted pipeline output, so use
+    # model_construct to skip Pydantic validation on each nested model
+    result = ResultModel.model_construct(
         query_id=query_id,
         query=query,
         answers=[serialize_answer(answer)],
         documents=[serialize_document(doc) for doc in answer.documents]
     )
 
-    return QueryResultsResponse(query_id=query_id, results=[result])
+    return QueryResultsResponse.model_construct(query_id=query_id, results=[result])
 
 def serialize_answer(answer: GeneratedAnswer) -> AnswerModel:
-    return AnswerModel(
+    return AnswerModel.model_construct(
         answer=answer.data,
         type="generative",
         document_ids=[doc.id for doc in answer.documents],
@@ -34,7 +36,7 @@ def serialize_answer(answer: GeneratedAnswer) -> AnswerModel:
     )
 
 def serialize_document(doc: Document) -> DocumentModel:
-    return DocumentModel(
+    return DocumentModel.model_construct(
         id=str(doc.id),
         content=doc.content,
         content_type="text",
@@ -47,8 +49,8 @@ def serialize_document(doc: Document) -> DocumentModel:
 
 def serialize_file(doc: Document | None) -> FileModel:
     if not doc:
-        return FileModel(id="", name="")
-    return FileModel(
+        return FileModel.model_construct(id="", name="")
+    return FileModel.model_construct(
         id="",
         name=os.path.basename(doc.meta.get("file_path", ""))
     )
@@ -3,8 +3,11 @@ import sys
 
 from dataclasses import dataclass
 import logging
+import traceback
 from typing import Optional
 
+import httpx
+
 from haystack import Pipeline
 from haystack.components.embedders import SentenceTransformersTextEmbedder
 from haystack.components.joiners import DocumentJoiner
@@ -25,7 +28,7 @@ from common.config import settings
 from common.document_store import get_qdrant_store
 
 # Import our code-defined pipeline
-from pipelines.query_pipeline import create_query_pipeline
+from pipelines.query_pipeline import create_query_pipeline, resolve_ollama_model
 
 
 logger = logging.getLogger(__name__)
@@ -58,10 +61,39 @@ class QueryService:
             self.model_pipelines = {}
         except Exception as e:
             logger.error(f"Failed to create pipeline: {e}")
-            import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
 
+    def warm_up(self):
+        """
+        Load model weights before the first request is served.
+        
+        Warms up the pipeline components (e.g. loads the SentenceTransformers
+        embedder) and, when Ollama is the generator, asks Ollama to load the
+        default model into memory. Failures are logged and do not prevent startup.
+        """
+        try:
+            logger.info("Warming up query pipeline components")
+            self.pipeline.warm_up()
+        except Exception as e:
+            logger.warning(f"Failed to warm up query pipeline: {e}")
+        
+        if settings.generator in ("vllm", "llamacpp"):
+            return
+        
+        model = resolve_ollama_model(settings.default_model, settings.ollama_quant)
+        try:
+            logger.info(f"Preloading Ollama model: {model}")
+            # A request with an empty prompt loads the model without generating
+            response = httpx.post(
+                f"{settings.ollama_api_url}/api/generate",
+                json={"model": model, "prompt": ""},
+                timeout=300
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Failed to preload Ollama model {model}: {e}")
+
     def get_pipeline_for_model(self, model: Optional[str] = None):
         """
         Get or create a pipeline for the specified model.
@@ -123,6 +155,5 @@ class QueryService:
         except Exception as e:
             logger.error(f"Error during search: {e}")
             # Log more details about the error
-            import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
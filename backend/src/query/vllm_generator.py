@@ -0,0 +1,90 @@
+from typing import List, Dict, Any, Optional
+import logging
+
+import httpx
+from haystack import component
+
+logger = logging.getLogger(__name__)
+
+@component
+class VLLMGenerator:
+    """
+    A component for generating text with an OpenAI-compatible completions server.
+
+    Works with vLLM (continuous batching, paged KV cache) and llama.cpp's
+    `llama-server`, both of which expose `POST /v1/completions`. The outputs
+    mirror OllamaGenerator (`replies` and `meta`) so it can be swapped into the
+    query pipeline without changing any connections.
+
+    Attributes:
+        model: Name of the model served by the inference server
+        url: Base URL of the inference server (e.g. http://vllm:8000)
+        generation_kwargs: Sampling parameters sent with every request (e.g. temperature, max_tokens)
+        timeout: Request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        model: str,
+        url: str,
+        generation_kwargs: Optional[Dict[str, Any]] = None,
+        timeout: int = 120,
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            model: Name of the model served by the inference server
+            url: Base URL of the inference server
+            generation_kwargs: Sampling parameters sent with every request
+            timeout: Request timeout in seconds (default: 120)
+        """
+        self.model = model
+        self.url = url
+        self.generation_kwargs = generation_kwargs or {}
+        self.timeout = timeout
+        # A single client keeps connections to the server alive between requests
+        self._client = httpx.Client(base_url=url, timeout=timeout)
+
+    @component.output_types(replies=List[str], meta=List[Dict[str, Any]])
+    def run(self, prompt: str, generation_kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Generate a completion for the given prompt.
+
+        Args:
+            prompt: The prompt to complete
+            generation_kwargs: Sampling parameters overriding the ones set at initialization
+
+        Returns:
+            Dictionary with the generated `replies` and their `meta`
+
+        Raises:
+            httpx.HTTPError: If the inference server request fails
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            **self.generation_kwargs,
+            **(generation_kwargs or {}),
+        }
+
+        response = self._client.post("/v1/completions", json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        choices = data.get("choices", [])
+        replies = [choice.get("text", "") for choice in choices]
+        meta = [
+            {
+                "model": data.get("model", self.model),
+                "finish_reason": choice.get("finish_reason"),
+                "usage": data.get("usage", {}),
+            }
+            for choice in choices
+        ]
+
+        return {"replies": replies, "meta": meta}
+
+    def close(self):
+        """Close the HTTP client."""
+        self._client.close()
@@ -2,18 +2,20 @@
 Prometheus metrics configuration.
 """
 import logging
-import time
-import functools
-from typing import Optional, Any, Dict, List
+from time import perf_counter_ns
+from typing import Optional, Any, Dict, List, Tuple
 
-from prometheus_client import Counter, Histogram, Gauge, start_http_server
-from fastapi import FastAPI
+from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Request, Response
 
 from common.config import settings
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
+# Resolved once at import; settings are not reloaded at runtime
+_METRICS_ENABLED = getattr(settings, 'metrics_enabled', False)
+
 # Global metrics registry
 counters = {}
 histograms = {}
@@ -23,6 +25,23 @@ gauges = {}
 component_call_counter = None
 component_latency_histogram = None
 
+# (component_name, component_type) labels per component class
+_type_cache: Dict[type, Tuple[str, str]] = {}
+
+def exponential_buckets(start: float, factor: float, count: int) -> List[float]:
+    """
+    Create histogram buckets where each bound is `factor` times the previous one.
+    
+    Args:
+        start: Upper bound of the first bucket
+        factor: Multiplier between consecutive bucket bounds
+        count: Number of buckets
+        
+    Returns:
+        List of bucket upper bounds
+    """
+    return [round(start * factor ** i, 3) for i in range(count)]
+
 def setup_metrics(service_name: str, port: int = 8000) -> None:
     """
     Configure Prometheus metrics.
@@ -34,10 +53,14 @@ def setup_metrics(service_name: str, port: int = 8000) -> None:
     global component_call_counter, component_latency_histogram
     
     # If metrics are not enabled, return None
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
         logger.info("Metrics are not enabled. Skipping metrics setup.")
         return
     
+    # Component metrics are process-wide and can only be registered once
+    if component_call_counter is not None:
+        return
+    
     try:
         logger.info(f"Setting up Prometheus metrics for {service_name}")
         
@@ -55,13 +78,67 @@ def setup_metrics(service_name: str, port: int = 8000) -> None:
             'haystack_component_latency_milliseconds',
             'Latency of Haystack component method calls in milliseconds',
             ['service', 'component_type', 'component_name', 'method'],
-            buckets=[1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 180000, 240000, 300000]
+            # 1 ms to ~4.4 minutes (LLM calls) in 10 buckets instead of 17
+            buckets=exponential_buckets(1, 4, 10)
         )
         
         logger.info(f"Metrics setup complete for {service_name}")
     except Exception as e:
         logger.error(f"Error setting up metrics: {e}")
 
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count and latency of HTTP requests.
+    
+    Requests are labelled with the route template (e.g. '/search') rather than
+    the raw path, and the labelled metric children are cached per
+    (method, path, status_code) so each request only does inc()/observe().
+    
+    Attributes:
+        app: The wrapped ASGI application
+        request_counter: Counter labelled by method, path and status_code
+        latency_histogram: Histogram labelled by method and path, in seconds
+    """
+    
+    def __init__(self, app, request_counter: Counter, latency_histogram: Histogram):
+        self.app = app
+        self.request_counter = request_counter
+        self.latency_histogram = latency_histogram
+        self._children: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = perf_counter_ns()
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", "none")
+            method = scope["method"]
+            
+            key = (method, path, status_code)
+            children = self._children.get(key)
+            if children is None:
+                children = self._children[key] = (
+                    self.request_counter.labels(method=method, path=path, status_code=str(status_code)),
+                    self.latency_histogram.labels(method=method, path=path)
+                )
+            
+            children[0].inc()
+            children[1].observe((perf_counter_ns() - start_time) * 1e-9)
+
 def instrument_fastapi_with_metrics(app: FastAPI, service_name: str) -> None:
     """
     Instrument a FastAPI application with Prometheus metrics.
@@ -71,19 +148,37 @@ def instrument_fastapi_with_metrics(app: FastAPI, service_name: str) -> None:
         service_name: Name of the service
     """
     # If metrics are not enabled, don't instrument
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
         return
     
     try:
         # Setup metrics
         setup_metrics(service_name)
         
-        from prometheus_fastapi_instrumentator import Instrumentator
-        
         # Instrument FastAPI for metrics
         logger.info(f"Instrumenting FastAPI app with metrics for {service_name}")
-        instrumentator = Instrumentator()
-        instrumentator.instrument(app).expose(app)
+        request_counter = create_counter(
+            name="http_requests_total",
+            description="Number of HTTP requests",
+            labels=["method", "path", "status_code"]
+        )
+        latency_histogram = create_histogram(
+            name="http_request_duration_seconds",
+            description="Latency of HTTP requests in seconds",
+            labels=["method", "path"],
+            buckets=exponential_buckets(0.005, 4, 8)
+        )
+        app.add_middleware(
+            MetricsMiddleware,
+            request_counter=request_counter,
+            latency_histogram=latency_histogram
+        )
+        
+        # Expose the metrics for Prometheus to scrape
+        async def metrics_endpoint(request: Request) -> Response:
+            return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
         logger.info(f"FastAPI metrics instrumentation complete for {service_name}")
     except Exception as e:
         logger.error(f"Error instrumenting FastAPI app with metrics: {e}")
@@ -100,16 +195,17 @@ def create_counter(name: str, description: str, labels: list = None) -> Optional
     Returns:
         A counter object or None if metrics are disabled
     """
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
         return None
     
     if labels is None:
         labels = []
     
-    if name not in counters:
-        counters[name] = Counter(name, description, labels)
+    counter = counters.get(name)
+    if counter is None:
+        counter = counters[name] = Counter(name, description, labels)
     
-    return counters[name]
+    return counter
 
 def create_histogram(name: str, description: str, labels: list = None, buckets: list = None) -> Optional[Histogram]:
     """
@@ -124,7 +220,7 @@ def create_histogram(name: str, description: str, labels: list = None, buckets:
     Returns:
         A histogram object or None if metrics are disabled
     """
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
         return None
     
     if labels is None:
@@ -134,10 +230,11 @@ def create_histogram(name: str, description: str, labels: list = None, buckets:
         # Default buckets suitable for milliseconds
         buckets = [1, 5, 10, 25, 50, 75, 100, 250, 500, 750, 1000, 2500, 5000, 7500, 10000]
     
-    if name not in histograms:
-        histograms[name] = Histogram(name, description, labels, buckets=buckets)
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = Histogram(name, description, labels, buckets=buckets)
     
-    return histograms[name]
+    return histogram
 
 def create_gauge(name: str, description: str, labels: list = None) -> Optional[Gauge]:
     """
@@ -151,16 +248,48 @@ def create_gauge(name: str, description: str, labels: list = None) -> Optional[G
     Returns:
         A gauge object or None if metrics are disabled
     """
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
         return None
     
     if labels is None:
         labels = []
     
-    if name not in gauges:
-        gauges[name] = Gauge(name, description, labels)
+    gauge = gauges.get(name)
+    if gauge is None:
+        gauge = gauges[name] = Gauge(name, description, labels)
+    
+    return gauge
+
+def describe_component(component_class: type) -> Tuple[str, str]:
+    """
+    Derive the metric name and type labels for a component class.
+    
+    Args:
+        component_class: The class of the component
+        
+    Returns:
+        A (component_name, component_type) tuple
+    """
+    cached = _type_cache.get(component_class)
+    if cached is not None:
+        return cached
+    
+    component_name = component_class.__name__
+    
+    # Determine component type based on module path
+    module_path = component_class.__module__
+    component_parts = module_path.split('.')
+    component_type = component_parts[-1] if len(component_parts) > 1 else "unknown"
+    
+    # If the component is in haystack, use a more specific type
+    if "haystack" in module_path:
+        # Extract the component category from the module path
+        haystack_parts = [part for part in component_parts if part not in ["haystack", "components", "component", "nodes"]]
+        if haystack_parts:
+            component_type = haystack_parts[0]
     
-    return gauges[name]
+    _type_cache[component_class] = (component_name, component_type)
+    return component_name, component_type
 
 def instrument_component_method(component, original_method, service_name):
     """
@@ -175,83 +304,73 @@ def instrument_component_method(component, original_method, service_name):
     Returns:
         The instrumented method
     """
+    # Component information is invariant for the instance, so derive it once here
+    component_name, component_type = describe_component(component.__class__)
+    method_name = original_method.__name__
+    
+    # The labels are fixed for this component, so resolve the labelled children once
+    labels = {
+        "service": service_name,
+        "component_type": component_type,
+        "component_name": component_name,
+        "method": method_name
+    }
+    # patch_pipeline_components only wraps components once both metrics exist
+    counter_child = component_call_counter.labels(**labels)
+    hist_child = component_latency_histogram.labels(**labels)
+    
     def instrumented_method(*args, **kwargs):
-        # Get component information
-        component_name = component.__class__.__name__
-        
-        # Determine component type based on module path
-        module_path = component.__class__.__module__
-        component_parts = module_path.split('.')
-        component_type = component_parts[-1] if len(component_parts) > 1 else "unknown"
-        
-        # If the component is in haystack, use a more specific type
-        if "haystack" in module_path:
-            # Extract the component category from the module path
-            haystack_parts = [part for part in component_parts if part not in ["haystack", "components", "component", "nodes"]]
-            if haystack_parts:
-                component_type = haystack_parts[0]
-        
-        method_name = original_method.__name__
-        
-        start_time = time.time()
+        start_time = perf_counter_ns()
         try:
             # Call the original method
             result = original_method(*args, **kwargs)
             
             # Record metrics on success
-            end_time = time.time()
-            latency_ms = (end_time - start_time) * 1000  # Convert to milliseconds
-            
-            if component_call_counter:
-                component_call_counter.labels(
-                    service=service_name,
-                    component_type=component_type,
-                    component_name=component_name,
-                    method=method_name
-                ).inc()
+            latency_ms = (perf_counter_ns() - start_time) * 1e-6  # Convert to milliseconds
             
-            if component_latency_histogram:
-                component_latency_histogram.labels(
-                    service=service_name,
-                    component_type=component_type,
-                    component_name=component_name,
-                    method=method_name
-                ).observe(latency_ms)
+            counter_child.inc()
+            hist_child.observe(latency_ms)
             
             return result
         except Exception as e:
             # Record failure but re-raise the exception
-            end_time = time.time()
-            latency_ms = (end_time - start_time) * 1000  # Convert to milliseconds
+            latency_ms = (perf_counter_ns() - start_time) * 1e-6  # Convert to milliseconds
             
-            if component_latency_histogram:
-                component_latency_histogram.labels(
-                    service=service_name,
-                    component_type=component_type,
-                    component_name=component_name,
-                    method=method_name
-                ).observe(latency_ms)
+            hist_child.observe(latency_ms)
             
             # Re-raise the original exception
             raise
             
     return instrumented_method
 
-def patch_pipeline_components(pipeline, service_name: str = "unknown"):
+def patch_pipeline_components(pipeline, service_name: str = "unknown", component_allowlist: Optional[List[str]] = None):
     """
-    Patch all components in a Haystack pipeline to collect metrics.
+    Patch the components in a Haystack pipeline to collect metrics.
     
-    This function monkey-patches the run method of all components in a pipeline
-    to add instrumentation. Call this on a pipeline before using it.
+    This function monkey-patches the run method of the components in a pipeline
+    to add instrumentation. Call this on a pipeline before using it. Only
+    components whose class name is in the allowlist are instrumented, so cheap
+    utility components (joiners, routers, builders) don't pay the wrapper cost.
     
     Args:
         pipeline: Haystack Pipeline instance
         service_name: Name of the service where the pipeline is running
+        component_allowlist: Component class names to instrument. Defaults to
+            settings.metrics_component_allowlist; an empty list instruments all components.
     
     Returns:
         The same pipeline with instrumented components
     """
-    if not hasattr(settings, 'metrics_enabled') or not settings.metrics_enabled:
+    if not _METRICS_ENABLED:
+        return pipeline
+    
+    # Pipelines can be created before the service calls setup_metrics; the
+    # component metrics must exist now because their labels are bound at wrap time
+    setup_metrics(service_name)
+    
+    # If the component metrics could not be created there is nothing to record,
+    # so leave the components untouched
+    if component_call_counter is None or component_latency_histogram is None:
         return pipeline
     
     # Check if pipeline is a valid Haystack Pipeline instance
@@ -274,25 +393,24 @@ def patch_pipeline_components(pipeline, service_name: str = "unknown"):
         logger.warning("No components found in pipeline to instrument")
         return pipeline
     
+    if component_allowlist is None:
+        component_allowlist = settings.metrics_component_allowlist
+    allowed = set(component_allowlist)
+    
     logger.info(f"Instrumenting {len(components)} pipeline components in {service_name}")
     
     # Patch each component's run method
     for name, component in components.items():
+        if allowed and component.__class__.__name__ not in allowed:
+            logger.debug(f"Skipping instrumentation of component {name} ({component.__class__.__name__})")
+            continue
+        
         if hasattr(component, "run") and callable(component.run):
             # Store a reference to the original method
             original_run = component.run
             
-            # Create an instrumented version
-            instrumented = instrument_component_method(component, original_run, service_name)
-            
-            # Bind the instrumented method to the component
-            # This approach uses a closure to avoid scope issues
-            def make_wrapper(orig_method, instr_method):
-                def wrapper(*args, **kwargs):
-                    return instr_method(*args, **kwargs)
-                return wrapper
-                
-            component.run = make_wrapper(original_run, instrumented)
+            # Replace run with the instrumented version, which closes over the original method
+            component.run = instrument_component_method(component, original_run, service_name)
             logger.debug(f"Instrumented component {name} ({component.__class__.__name__})")
     
     return pipeline 
\ No newline at end of file
@@ -1,17 +1,7 @@
 """
 OpenTelemetry tracing configuration with Jaeger exporter.
 """
-import os
 import logging
-from opentelemetry import trace
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.trace.sampling import ALWAYS_ON
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.haystack import HaystackInstrumentor
-from opentelemetry.semconv.resource import ResourceAttributes
 import functools
 
 from common.config import settings
@@ -19,6 +9,9 @@ from common.config import settings
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
+# Whether patch_haystack_tracing has already been applied
+_patched = False
+
 def setup_tracer(service_name):
     """
     Configure OpenTelemetry with OTLP exporter.
@@ -29,37 +22,50 @@ def setup_tracer(service_name):
     Returns:
         tracer: An OpenTelemetry tracer object
     """
+    # The OpenTelemetry SDK and instrumentors are imported here rather than at
+    # module level so services without tracing don't pay for loading them
+    from opentelemetry import trace
+    
     # If tracing is not enabled, return a no-op tracer
     if not settings.tracing_enabled:
         return trace.get_tracer(service_name)
     
     try:
-        logger.info(f"Setting up OpenTelemetry tracing for {service_name}")
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.instrumentation.haystack import HaystackInstrumentor
+        from opentelemetry.semconv.resource import ResourceAttributes
         
-        # Set environment variables for OpenTelemetry
-        os.environ["OTEL_RESOURCE_ATTRIBUTES"] = f"service.name={service_name}"
-        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"http://{settings.jaeger_host}:4318"
-        os.environ["OTEL_TRACES_SAMPLER"] = "always_on"
+        logger.info(f"Setting up OpenTelemetry tracing for {service_name}")
         
         # Create a resource to identify the service using proper constants
         resource = Resource.create({
             ResourceAttributes.SERVICE_NAME: service_name
         })
         
-        # Create a tracer provider with ALWAYS_ON sampler
+        # Create a tracer provider that samples a ratio of new traces and
+        # follows the parent's sampling decision for propagated ones
         tracer_provider = TracerProvider(
             resource=resource,
-            sampler=ALWAYS_ON
+            sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
         )
         
-        # Create an OTLP HTTP exporter pointing to Jaeger
+        # Create an OTLP gRPC exporter pointing to Jaeger
         otlp_exporter = OTLPSpanExporter(
-            endpoint=f"http://{settings.jaeger_host}:4318/v1/traces"
+            endpoint=f"http://{settings.jaeger_host}:4317",
+            insecure=True
         )
         
-        # Add the exporter to the tracer provider
-        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
-        
+        # Add the exporter to the tracer provider, batching spans to keep export off the request path
+        tracer_provider.add_span_processor(BatchSpanProcessor(
+            otlp_exporter,
+            max_queue_size=4096,
+            schedule_delay_millis=5000,
+            max_export_batch_size=512
+        ))
         
         # Set the global tracer provider
         trace.set_tracer_provider(tracer_provider)
@@ -80,8 +86,18 @@ def setup_tracer(service_name):
         haystack.tracing.enable_tracing(haystack_tracer)
         logger.info(f"Explicitly enabled Haystack OpenTelemetry tracer for {service_name}")
         
+        # Content tracing records prompts and documents on every span, so it is
+        # only honoured in development
+        content_tracing = settings.tracing_content_enabled
+        if content_tracing and settings.app_env != "development":
+            logger.warning(
+                f"Content tracing is enabled but app environment is '{settings.app_env}'; "
+                "content tracing is only allowed in development and will be disabled"
+            )
+            content_tracing = False
+        
         # Also configure content tracing if requested
-        if settings.tracing_content_enabled:
+        if content_tracing:
             logger.info("Enabling Haystack instrumentation with content tracing")
             HaystackInstrumentor().instrument(
                 tracer_provider=tracer_provider,
@@ -109,9 +125,14 @@ def instrument_fastapi(app, service_name):
         return
     
     try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        
         # Setup the tracer
         setup_tracer(service_name)
         
+        # Ensure our spans share the trace context with Haystack's spans
+        patch_haystack_tracing()
+        
         # Instrument FastAPI
         logger.info(f"Instrumenting FastAPI app for {service_name}")
         FastAPIInstrumentor.instrument_app(app)
@@ -135,20 +156,23 @@ def trace_pipeline_creation(service_name="pipeline_service"):
         Decorator function
     """
     def decorator(func):
+        # If tracing is disabled, leave the function undecorated
+        if not settings.tracing_enabled:
+            return func
+        
+        from opentelemetry import trace
+        
+        # Fetch the tracer once; we use the same tracer that Haystack uses internally.
+        # Before setup_tracer runs this is a proxy that delegates to the global
+        # tracer provider once it is set
+        tracer = trace.get_tracer("haystack.pipeline")
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # If tracing is disabled, just call the function
-            if not settings.tracing_enabled:
-                return func(*args, **kwargs)
-            
             # Get the function name and arguments for span attributes
             func_name = func.__name__
             pipeline_type = func_name.replace("create_", "").replace("_pipeline", "")
             
-            # Get current tracer
-            # We use the same tracer that Haystack uses internally
-            tracer = trace.get_tracer("haystack.pipeline")
-            
             # Create a span for the pipeline creation
             with tracer.start_as_current_span(
                 "haystack.pipeline.create",
@@ -161,11 +185,12 @@ def trace_pipeline_creation(service_name="pipeline_service"):
                 # Record the start of pipeline creation
                 span.add_event("pipeline_creation_started")
                 
-                # Add attributes for important configuration parameters
-                for key, value in kwargs.items():
-                    # Only add primitive types as attributes
-                    if isinstance(value, (str, int, float, bool)) and key != "password":
-                        span.set_attribute(f"haystack.pipeline.config.{key}", str(value))
+                # Add attributes for important configuration parameters (primitive types only)
+                span.set_attributes({
+                    f"haystack.pipeline.config.{key}": str(value)
+                    for key, value in kwargs.items()
+                    if key != "password" and isinstance(value, (str, int, float, bool))
+                })
                 
                 try:
                     # Create the pipeline
@@ -179,35 +204,30 @@ def trace_pipeline_creation(service_name="pipeline_service"):
                     
                     # Create a more detailed span architecture description
                     if hasattr(pipeline, "graph") and pipeline.graph is not None:
-                        connections = []
-                        for node in pipeline.graph.nodes:
-                            outgoing = []
+                        # Group outgoing connections by source node in a single pass over the edges
+                        outgoing_by_src = {}
+                        try:
+                            # For Haystack 2.x pipeline graphs (MultiDiGraph) the edge data
+                            # is returned with the edge, so no get_edge_data lookup is needed
+                            for src, dest, edge_data in pipeline.graph.edges(data=True):
+                                if edge_data and "source_socket" in edge_data and "dest_socket" in edge_data:
+                                    # Format: target.socket_name
+                                    target = f"{dest}.{edge_data['dest_socket']}"
+                                else:
+                                    # Fallback: just show the target node
+                                    target = f"{dest}"
+                                outgoing_by_src.setdefault(src, []).append(target)
+                        except Exception as e:
+                            # Ultimate fallback if the graph does not support edge data
+                            logger.debug(f"Error extracting edge data: {e}")
                             for edge in pipeline.graph.edges:
-                                # In a MultiDiGraph, edges are typically (u, v, key) tuples
-                                # where 'key' is the edge key/id, not the socket name
-                                if edge[0] == node:
-                                    # Need to inspect the edge attributes for connection info
-                                    # but gracefully handle different graph implementations
-                                    try:
-                                        # For Haystack 2.x pipeline graphs
-                                        if len(edge) >= 3 and hasattr(pipeline.graph, "get_edge_data"):
-                                            # Get edge data might contain socket information
-                                            edge_data = pipeline.graph.get_edge_data(edge[0], edge[1], edge[2])
-                                            if edge_data and "source_socket" in edge_data and "dest_socket" in edge_data:
-                                                # Format: target.socket_name
-                                                outgoing.append(f"{edge[1]}.{edge_data['dest_socket']}")
-                                            else:
-                                                # Fallback: just show the target node
-                                                outgoing.append(f"{edge[1]}")
-                                        else:
-                                            # Simple fallback for other graph types
-                                            outgoing.append(f"{edge[1]}")
-                                    except Exception as e:
-                                        # Ultimate fallback if anything goes wrong
-                                        logger.debug(f"Error extracting edge data: {e}")
-                                        outgoing.append(f"{edge[1]}")
-                            if outgoing:
-                                connections.append(f"{node} -> {', '.join(outgoing)}")
+                                outgoing_by_src.setdefault(edge[0], []).append(f"{edge[1]}")
+                        
+                        connections = [
+                            f"{node} -> {', '.join(outgoing_by_src[node])}"
+                            for node in pipeline.graph.nodes
+                            if node in outgoing_by_src
+                        ]
                         if connections:
                             span.set_attribute("haystack.pipeline.connections", str(connections))
                     
@@ -230,13 +250,18 @@ def patch_haystack_tracing():
     Patch Haystack's tracing system to ensure our spans are properly included
     in the same trace context.
     
-    This is a compatibility function that should be called once at application startup.
+    This is a compatibility function that is called by instrument_fastapi once the
+    tracer has been set up. Repeated calls are no-ops.
     """
-    if not settings.tracing_enabled:
+    global _patched
+    
+    if not settings.tracing_enabled or _patched:
         return
     
     try:
         import haystack.tracing as haystack_tracing
+        from opentelemetry.trace import get_current_span
+        from opentelemetry.trace.span import INVALID_SPAN
         
         # Store the original trace function
         original_trace = haystack_tracing.tracer.trace
@@ -244,26 +269,21 @@ def patch_haystack_tracing():
         # Create a patched version that ensures our spans get the right context
         @functools.wraps(original_trace)
         def patched_trace(operation_name, tags=None, parent_span=None):
-            # Get the current span context if available
-            current_span = trace.get_current_span()
-            if parent_span is None and current_span is not None:
-                # Only use current span as parent if it's not a non-recording span
-                try:
-                    if hasattr(current_span, "is_recording") and current_span.is_recording():
-                        parent_span = current_span
-                except:
-                    pass
+            if parent_span is None:
+                # get_current_span returns INVALID_SPAN when there is no active span;
+                # only use the current span as parent if it is recording
+                current_span = get_current_span()
+                if current_span is not INVALID_SPAN and current_span.is_recording():
+                    parent_span = current_span
                 
             # Call the original with the enhanced context
             return original_trace(operation_name, tags, parent_span)
         
         # Apply the patch to Haystack's tracer
         haystack_tracing.tracer.trace = patched_trace
+        _patched = True
         
         logger.info("Successfully patched Haystack tracing system for improved integration")
     except Exception as e:
         logger.warning(f"Failed to patch Haystack tracing system: {e}")
         logger.warning("Custom spans may not appear in the same trace context as Haystack spans")
-
-# Initialize patching on module import
-patch_haystack_tracing() 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Benchmarks for the query pipeline.
+
+These run the real pipeline and require the Elasticsearch, Qdrant and Ollama
+services to be reachable. Run with:
+
+    pytest tests/benchmarks --benchmark-only
+
+A plain pytest run skips them unless RUN_BENCHMARKS=1 is set.
+
+The module can also be run directly for an ad-hoc check of the pipeline.
+"""
+import os
+import sys
+from pathlib import Path
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+import pytest
+
+from pipelines.query_pipeline import create_query_pipeline
+
+SAMPLE_QUERIES = [
+    "What is Haystack?",
+    "How are documents indexed?",
+]
+
+def build_inputs(query):
+    # Create inputs for each component that needs the query
+    return {
+        "query_embedder": {"text": query},
+        "bm25_retriever": {"query": query},
+        "prompt_builder": {"query": query},
+        "answer_builder": {"query": query}
+    }
+
+@pytest.fixture(scope="module", autouse=True)
+def require_benchmarks(request):
+    # Module-scoped so the skip happens before the pipeline fixture is built
+    if not (request.config.getoption("benchmark_only", False) or os.environ.get("RUN_BENCHMARKS")):
+        pytest.skip("benchmarks need --benchmark-only or RUN_BENCHMARKS=1")
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return create_query_pipeline()
+
+@pytest.mark.integration
+@pytest.mark.benchmark(group="query_pipeline")
+@pytest.mark.parametrize("query", SAMPLE_QUERIES)
+def test_query_pipeline_run(benchmark, pipeline, query):
+    results = benchmark(pipeline.run, build_inputs(query))
+
+    assert "answer_builder" in results
+    assert results["answer_builder"]["answers"]
+
+def main():
+    # Create the pipeline using our code-defined pipeline function
+    print("Creating pipeline...")
+    pipeline = create_query_pipeline()
+
+    # Print success message
+    print("Pipeline created successfully!")
+
+    # Print pipeline structure information
+    print("\nPipeline component names:")
+    for component_name in pipeline.graph.nodes:
+        print(f"  - {component_name}")
+
+    # Test running the pipeline with a sample query
+    try:
+        print("\nTesting pipeline with a sample query...")
+
+        # Run the pipeline
+        results = pipeline.run(build_inputs(SAMPLE_QUERIES[0]))
+
+        print(f"Pipeline run successful. Result keys: {results.keys()}")
+
+        # Check if we got an answer
+        if "answer_builder" in results and "answers" in results["answer_builder"]:
+            print(f"Got answer: {results['answer_builder']['answers'][0]}")
+        else:
+            print(f"No answer generated. Available results: {results}")
+
+    except Exception as e:
+        print(f"Error running pipeline: {e}")
+        import traceback
+        print(f"Traceback: {traceback.format_exc()}")
+
+if __name__ == "__main__":
+    main()
@@ -49,4 +49,14 @@ def test_valid_log_levels():
 def test_case_insensitive_log_levels():
     settings = Settings(log_level="debug", haystack_log_level="info")
     assert settings.log_level == "DEBUG"
-    assert settings.haystack_log_level == "INFO" 
\ No newline at end of file
+    assert settings.haystack_log_level == "INFO"
+
+def test_invalid_generator():
+    # Unknown backends must fail rather than silently fall back to Ollama
+    with pytest.raises(ValidationError) as exc_info:
+        Settings(generator="openai")
+    assert "Invalid generator" in str(exc_info.value)
+
+def test_valid_generators():
+    for generator in ['ollama', 'vllm', 'llamacpp']:
+        assert Settings(generator=generator).generator == generator
@@ -1,17 +1,10 @@
 import pytest
-from unittest.mock import Mock, patch
-import sys
-import os
-
-# Add the src directory to the path if not already there
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
+from unittest.mock import Mock, patch, DEFAULT
 
 from common.document_store import initialize_document_store, get_qdrant_store
 from common.config import Settings
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_settings():
     return Settings(
         elasticsearch_url="http://test:9200",
@@ -22,14 +15,26 @@ def mock_settings():
         qdrant_collection_name="test_collection"
     )
 
-@patch("common.document_store.settings")
-@patch("common.document_store.ElasticsearchDocumentStore")
-def test_initialize_document_store(mock_es_store, mock_settings_module, mock_settings):
-    # Set up the mock settings
-    mock_settings_module.elasticsearch_url = mock_settings.elasticsearch_url
-    mock_settings_module.elasticsearch_user = mock_settings.elasticsearch_user
-    mock_settings_module.elasticsearch_password = mock_settings.elasticsearch_password
-    mock_settings_module.embedding_dim = mock_settings.embedding_dim
+@pytest.fixture(scope="module")
+def document_store_mocks(mock_settings):
+    """Patch settings and both document store classes once for the module."""
+    with patch.multiple(
+        "common.document_store",
+        settings=DEFAULT,
+        ElasticsearchDocumentStore=DEFAULT,
+        QdrantDocumentStore=DEFAULT
+    ) as mocks:
+        mock_settings_module = mocks["settings"]
+        mock_settings_module.elasticsearch_url = mock_settings.elasticsearch_url
+        mock_settings_module.elasticsearch_user = mock_settings.elasticsearch_user
+        mock_settings_module.elasticsearch_password = mock_settings.elasticsearch_password
+        mock_settings_module.embedding_dim = mock_settings.embedding_dim
+        mock_settings_module.qdrant_url = mock_settings.qdrant_url
+        mock_settings_module.qdrant_collection_name = mock_settings.qdrant_collection_name
+        yield mocks["ElasticsearchDocumentStore"], mocks["QdrantDocumentStore"], mock_settings_module
+
+def test_initialize_document_store(document_store_mocks, mock_settings):
+    mock_es_store, _, _ = document_store_mocks
 
     # Mock the ElasticsearchDocumentStore constructor
     mock_instance = Mock()
@@ -51,13 +56,8 @@ def test_initialize_document_store(mock_es_store, mock_settings_module, mock_set
     # Assert the function returns the instance
     assert doc_store == mock_instance
 
-@patch("common.document_store.settings")
-@patch("common.document_store.QdrantDocumentStore")
-def test_get_qdrant_store(mock_qdrant_store, mock_settings_module, mock_settings):
-    # Set up the mock settings
-    mock_settings_module.qdrant_url = mock_settings.qdrant_url
-    mock_settings_module.qdrant_collection_name = mock_settings.qdrant_collection_name
-    mock_settings_module.embedding_dim = mock_settings.embedding_dim
+def test_get_qdrant_store(document_store_mocks, mock_settings):
+    _, mock_qdrant_store, _ = document_store_mocks
     
     # Mock the QdrantDocumentStore constructor
     mock_instance = Mock()
@@ -79,4 +79,4 @@ def test_get_qdrant_store(mock_qdrant_store, mock_settings_module, mock_settings
     )
     
     # Assert the function returns the instance
-    assert result == mock_instance 
\ No newline at end of file
+    assert result == mock_instance
\ No newline at end of file
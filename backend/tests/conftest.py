@@ -1,10 +1,32 @@
 """
-This file is automatically loaded by pytest and sets up the environment for all tests.
+This file is automatically loaded by pytest and provides fixtures shared by all tests.
 """
-import os
-import sys
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
 
-# Add the src directory to the path if not already there
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
-if src_path not in sys.path:
-    sys.path.insert(0, src_path) 
\ No newline at end of file
+@pytest.fixture(scope="session")
+def query_client():
+    """
+    TestClient for the query service app, entered once per session so the
+    app's lifespan startup runs a single time. QueryService.warm_up is stubbed
+    so startup doesn't load models or call Ollama.
+    """
+    # Imported here so collecting unrelated tests doesn't build the query service
+    from query.main import app
+    from query.service import QueryService
+
+    with patch.object(QueryService, "warm_up"), TestClient(app) as c:
+        yield c
+
+@pytest.fixture(scope="session")
+def indexing_client():
+    """
+    TestClient for the indexing service app, entered once per session so the
+    app's lifespan startup runs a single time.
+    """
+    # Imported here so collecting unrelated tests doesn't build the indexing service
+    from indexing.main import app
+
+    with TestClient(app) as c:
+        yield c
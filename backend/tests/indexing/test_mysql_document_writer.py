@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, patch, ANY
 import json
+from types import SimpleNamespace
 
 # Create a mock Document class to avoid importing Haystack
 class MockDocument:
@@ -13,9 +14,9 @@ class MockDocument:
 # Now import our MySQL writer classes
 from indexing.mysql_document_writer import MySQLDocumentWriter, MySQLSourceDocumentWriter
 
-@pytest.fixture
-def mock_mysql_connection():
-    """Create a mock MySQL connection and cursor."""
+@pytest.fixture(scope="module")
+def mysql_connection():
+    """Create a mock MySQL connection and cursor once for the module."""
     mock_conn = Mock()
     mock_cursor = Mock()
     mock_conn.cursor.return_value = mock_cursor
@@ -23,6 +24,14 @@ def mock_mysql_connection():
     return mock_conn, mock_cursor
 
 @pytest.fixture
+def mock_mysql_connection(mysql_connection):
+    """Clear the shared connection's recorded calls before each test."""
+    mock_conn, mock_cursor = mysql_connection
+    mock_conn.reset_mock()
+    mock_cursor.reset_mock()
+    return mysql_connection
+
+@pytest.fixture(scope="module")
 def sample_documents():
     """Create sample documents for testing."""
     return [
@@ -38,27 +47,99 @@ def sample_documents():
         )
     ]
 
+def document_row(doc):
+    """Expected wrag_documents row for a document, with meta as a dict."""
+    return (doc.id, doc.meta["file_path"], None, None, None, doc.meta)
+
+def source_document_row(doc):
+    """Expected source_documents row for a document, with meta as a dict."""
+    return (doc.meta["file_path"], len(doc.content), doc.meta)
+
+@pytest.mark.parametrize("writer_cls", [MySQLDocumentWriter, MySQLSourceDocumentWriter])
+@patch('mysql.connector.connect')
+def test_initialization(mock_connect, writer_cls):
+    """Test that the writer initializes correctly."""
+    writer = writer_cls(
+        host="test-host",
+        user="test-user",
+        password="test-pass",
+        database="test-db",
+        port=3307
+    )
+    
+    assert writer.host == "test-host"
+    assert writer.user == "test-user"
+    assert writer.password == "test-pass"
+    assert writer.database == "test-db"
+    assert writer.port == 3307
+    assert writer.conn is None
+
+@pytest.fixture(scope="module", params=[
+    (MySQLDocumentWriter, document_row),
+    (MySQLSourceDocumentWriter, source_document_row),
+], ids=["document_writer", "source_document_writer"])
+def writer_run(request, sample_documents):
+    """Run each writer once over the sample documents and record the outcome."""
+    writer_cls, expected_row = request.param
+    
+    # A dedicated connection keeps the recorded calls isolated from the
+    # per-test resets of the shared mock connection
+    mock_conn = Mock()
+    mock_cursor = Mock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_conn.is_connected.return_value = True
+    # Every source document exists, so the document writer skips none of them
+    mock_cursor.fetchall.return_value = [(doc.meta["file_path"],) for doc in sample_documents]
+    
+    writer = writer_cls(
+        host="test-host",
+        user="test-user",
+        password="test-pass",
+        database="test-db"
+    )
+    
+    # Mock _get_connection to return our mock
+    writer._get_connection = Mock(return_value=mock_conn)
+    
+    result = writer.run(documents=sample_documents)
+    
+    return SimpleNamespace(
+        conn=mock_conn,
+        cursor=mock_cursor,
+        result=result,
+        expected_row=expected_row,
+        # Rows passed to the batched INSERT; the document writer's source
+        # document lookup goes through cursor.execute and is not included
+        rows=mock_cursor.executemany.call_args.args[1]
+    )
+
+def test_run_with_documents(writer_run, sample_documents):
+    """Test run method with sample documents."""
+    # Verify a single batched INSERT with one row per document; the JSON-encoded
+    # meta column is checked per document in test_execute_call
+    writer_run.cursor.executemany.assert_called_once()
+    expected = [writer_run.expected_row(doc)[:-1] + (ANY,) for doc in sample_documents]
+    assert writer_run.rows == expected
+    
+    # Verify connection was committed and cursor closed
+    writer_run.conn.commit.assert_called_once()
+    writer_run.cursor.close.assert_called_once()
+    
+    # Verify written documents returned
+    assert writer_run.result["written_documents"] == sample_documents
+
+@pytest.mark.parametrize("doc_index", [0, 1])
+def test_execute_call(writer_run, sample_documents, doc_index):
+    """Test that each document's inserted row stored its meta as JSON."""
+    doc = sample_documents[doc_index]
+    row = writer_run.rows[doc_index]
+    
+    # The last column is the JSON-encoded meta
+    assert json.loads(row[-1]) == writer_run.expected_row(doc)[-1]
+
 class TestMySQLDocumentWriter:
     """Tests for the MySQLDocumentWriter class."""
     
-    @patch('mysql.connector.connect')
-    def test_initialization(self, mock_connect):
-        """Test that the writer initializes correctly."""
-        writer = MySQLDocumentWriter(
-            host="test-host",
-            user="test-user",
-            password="test-pass",
-            database="test-db",
-            port=3307
-        )
-        
-        assert writer.host == "test-host"
-        assert writer.user == "test-user"
-        assert writer.password == "test-pass"
-        assert writer.database == "test-db"
-        assert writer.port == 3307
-        assert writer.conn is None
-    
     @patch('mysql.connector.connect')
     def test_get_connection(self, mock_connect):
         """Test that the connection is created properly."""
@@ -97,53 +178,6 @@ class TestMySQLDocumentWriter:
         
         assert result == {"written_documents": []}
     
-    def test_run_with_documents(self, mock_mysql_connection, sample_documents):
-        """Test run method with sample documents."""
-        mock_conn, mock_cursor = mock_mysql_connection
-        
-        writer = MySQLDocumentWriter(
-            host="test-host",
-            user="test-user",
-            password="test-pass",
-            database="test-db"
-        )
-        
-        # Mock _get_connection to return our mock
-        writer._get_connection = Mock(return_value=mock_conn)
-        
-        result = writer.run(documents=sample_documents)
-        
-        # Verify cursor was called correctly
-        assert mock_cursor.execute.call_count == 2
-        
-        # Check that the query included the right parameters
-        expected_args = [
-            (
-                "doc1",
-                "source1",
-                json.dumps({"source_id": "source1", "file_path": "/path/to/file1.txt"})
-            ),
-            (
-                "doc2",
-                "source2",
-                json.dumps({"source_id": "source2", "file_path": "/path/to/file2.txt"})
-            )
-        ]
-        
-        # Verify each call to execute
-        for i, doc in enumerate(sample_documents):
-            args = mock_cursor.execute.call_args_list[i][0][1]
-            assert args[0] == doc.id
-            assert args[1] == doc.meta["source_id"]
-            assert json.loads(args[2]) == doc.meta
-        
-        # Verify connection was committed and cursor closed
-        mock_conn.commit.assert_called_once()
-        mock_cursor.close.assert_called_once()
-        
-        # Verify written documents returned
-        assert result["written_documents"] == sample_documents
-    
     def test_close(self, mock_mysql_connection):
         """Test close method."""
         mock_conn, _ = mock_mysql_connection
@@ -160,58 +194,3 @@ class TestMySQLDocumentWriter:
         
         mock_conn.close.assert_called_once()
 
-
-class TestMySQLSourceDocumentWriter:
-    """Tests for the MySQLSourceDocumentWriter class."""
-    
-    @patch('mysql.connector.connect')
-    def test_initialization(self, mock_connect):
-        """Test that the writer initializes correctly."""
-        writer = MySQLSourceDocumentWriter(
-            host="test-host",
-            user="test-user",
-            password="test-pass",
-            database="test-db",
-            port=3307
-        )
-        
-        assert writer.host == "test-host"
-        assert writer.user == "test-user"
-        assert writer.password == "test-pass"
-        assert writer.database == "test-db"
-        assert writer.port == 3307
-        assert writer.conn is None
-    
-    def test_run_with_documents(self, mock_mysql_connection, sample_documents):
-        """Test run method with sample documents."""
-        mock_conn, mock_cursor = mock_mysql_connection
-        
-        writer = MySQLSourceDocumentWriter(
-            host="test-host",
-            user="test-user",
-            password="test-pass",
-            database="test-db"
-        )
-        
-        # Mock _get_connection to return our mock
-        writer._get_connection = Mock(return_value=mock_conn)
-        
-        result = writer.run(documents=sample_documents)
-        
-        # Verify cursor was called correctly
-        assert mock_cursor.execute.call_count == 2
-        
-        # Check that the execute calls included the right parameters
-        for i, doc in enumerate(sample_documents):
-            args = mock_cursor.execute.call_args_list[i][0][1]
-            assert args[0] == doc.id
-            assert args[1] == doc.content
-            assert args[2] == doc.meta.get("file_path")
-            assert json.loads(args[3]) == doc.meta
-        
-        # Verify connection was committed and cursor closed
-        mock_conn.commit.assert_called_once()
-        mock_cursor.close.assert_called_once()
-        
-        # Verify written documents returned
-        assert result["written_documents"] == sample_documents 
\ No newline at end of file
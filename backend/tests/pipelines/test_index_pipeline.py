@@ -1,6 +1,9 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from pipelines.index_pipeline import create_index_pipeline
 
 # Import mock classes instead of real ones
 # We'll mock all of the Haystack imports to avoid the protobuf/TensorFlow issues
@@ -12,193 +15,152 @@ def mock_es_store():
 def mock_qdrant_store():
     return Mock(name="QdrantDocumentStore")
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_settings():
-    settings = MagicMock()
-    # Set default values
-    settings.mysql_host = "localhost"
-    settings.mysql_user = "root"
-    settings.mysql_password = "password"
-    settings.mysql_database = "wrag"
-    settings.mysql_port = 3306
-    settings.mysql_enabled = False  # Default to disabled
-    return settings
+    # Shared defaults; tests that need other values patch in a copy
+    return SimpleNamespace(
+        mysql_host="localhost",
+        mysql_user="root",
+        mysql_password="password",
+        mysql_database="wrag",
+        mysql_port=3306,
+        mysql_enabled=False  # Default to disabled
+    )
 
-@pytest.fixture
-def mock_pipeline():
-    pipeline = MagicMock()
-    # Create a mock graph with nodes and edges
-    pipeline.graph = MagicMock()
-    pipeline.graph.nodes = set()
-    pipeline.graph.edges = {}
+class FakePipeline:
+    """Stand-in for haystack.Pipeline that records the components and connections it is given."""
     
-    # Override add_component to update our mock graph
-    def mock_add_component(name, component):
-        pipeline.graph.nodes.add(name)
-        return component
-    pipeline.add_component.side_effect = mock_add_component
+    def __init__(self):
+        self.graph = SimpleNamespace(nodes=set(), edges={})
+        self.add_component_calls = []
     
-    # Override connect to update our mock graph edges
-    def mock_connect(source, sink):
-        source_node = source.split('.')[0]
-        sink_node = sink.split('.')[0]
-        if source_node not in pipeline.graph.edges:
-            pipeline.graph.edges[source_node] = []
-        pipeline.graph.edges[source_node] = {
-            "sink_node": sink_node
-        }
-    pipeline.connect.side_effect = mock_connect
+    def add_component(self, name, component):
+        self.graph.nodes.add(name)
+        self.add_component_calls.append((name, component))
     
-    return pipeline
+    def connect(self, source, sink):
+        self.graph.edges[source.split('.')[0]] = {"sink_node": sink.split('.')[0]}
+
+@pytest.fixture
+def fake_pipeline():
+    return FakePipeline()
+
+# Haystack classes and MySQL writers replaced in pipelines.index_pipeline,
+# keyed by the attribute name they are exposed under on the mocks namespace
+PATCHED_CLASSES = {
+    "pipeline_class": "Pipeline",
+    "router": "FileTypeRouter",
+    "txt_converter": "TextFileToDocument",
+    "pdf_converter": "PyPDFToDocument",
+    "md_converter": "MarkdownToDocument",
+    "joiner": "DocumentJoiner",
+    "cleaner": "DocumentCleaner",
+    "splitter": "DocumentSplitter",
+    "embedder": "SentenceTransformersDocumentEmbedder",
+    "doc_writer": "DocumentWriter",
+    "mysql_source_writer_class": "MySQLSourceDocumentWriter",
+    "mysql_document_writer_class": "MySQLDocumentWriter",
+}
+
+@pytest.fixture
+def mocks(fake_pipeline):
+    """Patch the pipeline's Haystack classes and MySQL writers in one ExitStack."""
+    with ExitStack() as stack:
+        patched = SimpleNamespace(**{
+            name: stack.enter_context(patch(f"pipelines.index_pipeline.{target}"))
+            for name, target in PATCHED_CLASSES.items()
+        })
+        patched.pipeline_class.return_value = fake_pipeline
+        yield patched
 
-# Patch the entire haystack Pipeline class
-@patch('pipelines.index_pipeline.Pipeline')
-# Patch other Haystack components
-@patch('pipelines.index_pipeline.FileTypeRouter')
-@patch('pipelines.index_pipeline.TextFileToDocument')
-@patch('pipelines.index_pipeline.PyPDFToDocument')
-@patch('pipelines.index_pipeline.MarkdownToDocument')
-@patch('pipelines.index_pipeline.DocumentJoiner')
-@patch('pipelines.index_pipeline.DocumentCleaner')
-@patch('pipelines.index_pipeline.DocumentSplitter')
-@patch('pipelines.index_pipeline.SentenceTransformersDocumentEmbedder')
-@patch('pipelines.index_pipeline.DocumentWriter')
 def test_create_index_pipeline_without_mysql(
-    mock_doc_writer,
-    mock_embedder,
-    mock_splitter,
-    mock_cleaner,
-    mock_joiner,
-    mock_md_converter,
-    mock_pdf_converter,
-    mock_txt_converter,
-    mock_router,
-    mock_pipeline_class,
+    monkeypatch,
+    mocks,
     mock_es_store, 
     mock_qdrant_store,
     mock_settings,
-    mock_pipeline
+    fake_pipeline
 ):
     """Test creating index pipeline without MySQL integration."""
     
-    # Setup pipeline mock
-    mock_pipeline_class.return_value = mock_pipeline
+    # The default settings have MySQL disabled
+    monkeypatch.setattr('pipelines.index_pipeline.settings', mock_settings)
+    
+    # Create the pipeline
+    pipeline = create_index_pipeline(
+        document_store=mock_es_store,
+        qdrant_store=mock_qdrant_store
+    )
     
-    # Ensure MySQL is disabled in settings
-    mock_settings.mysql_enabled = False
+    # Check that correct components were added
+    assert ("file_router", mocks.router.return_value) in fake_pipeline.add_component_calls
+    assert ("document_joiner", mocks.joiner.return_value) in fake_pipeline.add_component_calls
+    assert ("document_cleaner", mocks.cleaner.return_value) in fake_pipeline.add_component_calls
+    assert ("document_splitter", mocks.splitter.return_value) in fake_pipeline.add_component_calls
     
-    # Import create_index_pipeline only when needed to avoid early importing
-    with patch('pipelines.index_pipeline.settings', mock_settings):
-        # Import locally to avoid import issues
-        from pipelines.index_pipeline import create_index_pipeline
-        
-        # Create the pipeline
-        pipeline = create_index_pipeline(
-            document_store=mock_es_store,
-            qdrant_store=mock_qdrant_store
-        )
-        
-        # Check that correct components were added
-        mock_pipeline.add_component.assert_any_call("file_router", mock_router.return_value)
-        mock_pipeline.add_component.assert_any_call("document_joiner", mock_joiner.return_value)
-        mock_pipeline.add_component.assert_any_call("document_cleaner", mock_cleaner.return_value)
-        mock_pipeline.add_component.assert_any_call("document_splitter", mock_splitter.return_value)
-        
-        # Ensure no MySQL-related calls
-        for call_args in mock_pipeline.add_component.call_args_list:
-            args, _ = call_args
-            assert "mysql" not in args[0]
+    # Ensure no MySQL-related calls
+    for component_name, _ in fake_pipeline.add_component_calls:
+        assert "mysql" not in component_name
 
-# Patch the entire haystack Pipeline class
-@patch('pipelines.index_pipeline.Pipeline')
-# Patch other Haystack components
-@patch('pipelines.index_pipeline.FileTypeRouter')
-@patch('pipelines.index_pipeline.TextFileToDocument')
-@patch('pipelines.index_pipeline.PyPDFToDocument')
-@patch('pipelines.index_pipeline.MarkdownToDocument')
-@patch('pipelines.index_pipeline.DocumentJoiner')
-@patch('pipelines.index_pipeline.DocumentCleaner')
-@patch('pipelines.index_pipeline.DocumentSplitter')
-@patch('pipelines.index_pipeline.SentenceTransformersDocumentEmbedder')
-@patch('pipelines.index_pipeline.DocumentWriter')
-@patch('pipelines.index_pipeline.MySQLSourceDocumentWriter')
-@patch('pipelines.index_pipeline.MySQLDocumentWriter')
 def test_create_index_pipeline_with_mysql(
-    mock_mysql_document_writer_class,
-    mock_mysql_source_writer_class,
-    mock_doc_writer,
-    mock_embedder,
-    mock_splitter,
-    mock_cleaner,
-    mock_joiner,
-    mock_md_converter,
-    mock_pdf_converter,
-    mock_txt_converter,
-    mock_router,
-    mock_pipeline_class,
+    monkeypatch,
+    mocks,
     mock_es_store, 
     mock_qdrant_store,
     mock_settings,
-    mock_pipeline
+    fake_pipeline
 ):
     """Test creating index pipeline with MySQL integration enabled."""
     
-    # Setup pipeline mock
-    mock_pipeline_class.return_value = mock_pipeline
-    
     # Configure mocks for MySQL writers
     mock_mysql_source_writer = Mock()
     mock_mysql_document_writer = Mock()
-    mock_mysql_source_writer_class.return_value = mock_mysql_source_writer
-    mock_mysql_document_writer_class.return_value = mock_mysql_document_writer
+    mocks.mysql_source_writer_class.return_value = mock_mysql_source_writer
+    mocks.mysql_document_writer_class.return_value = mock_mysql_document_writer
+    
+    # Enable MySQL in a copy of the shared settings
+    mysql_settings = SimpleNamespace(**{
+        **vars(mock_settings),
+        "mysql_enabled": True,
+        "mysql_host": "test-mysql-host",
+        "mysql_user": "test-user",
+        "mysql_password": "test-password",
+        "mysql_database": "test-db",
+        "mysql_port": 3307
+    })
+    monkeypatch.setattr('pipelines.index_pipeline.settings', mysql_settings)
+    
+    # Create the pipeline
+    pipeline = create_index_pipeline(
+        document_store=mock_es_store,
+        qdrant_store=mock_qdrant_store
+    )
+    
+    # Verify MySQL writers were created 
+    assert mocks.mysql_source_writer_class.called, "MySQLSourceDocumentWriter constructor not called"
+    assert mocks.mysql_document_writer_class.called, "MySQLDocumentWriter constructor not called"
+    
+    # Check that each MySQL writer was added as a component to the pipeline
+    for component_name, component in fake_pipeline.add_component_calls:
+        if component_name == "mysql_source_writer":
+            assert component == mock_mysql_source_writer
+        elif component_name == "mysql_document_writer":
+            assert component == mock_mysql_document_writer
     
-    # Enable MySQL in settings
-    mock_settings.mysql_enabled = True
-    mock_settings.mysql_host = "test-mysql-host"
-    mock_settings.mysql_user = "test-user"
-    mock_settings.mysql_password = "test-password"
-    mock_settings.mysql_database = "test-db"
-    mock_settings.mysql_port = 3307
+    # Verify the MySQL writers were created with the correct parameters
+    # This check is safer in case call_args is None
+    if mocks.mysql_source_writer_class.call_args and len(mocks.mysql_source_writer_class.call_args) >= 2:
+        kwargs = mocks.mysql_source_writer_class.call_args[1]
+        assert kwargs.get("host") == "test-mysql-host"
+        assert kwargs.get("user") == "test-user"
+        assert kwargs.get("password") == "test-password"
+        assert kwargs.get("database") == "test-db"
+        assert kwargs.get("port") == 3307
     
-    # Import create_index_pipeline only when needed to avoid early importing
-    with patch('pipelines.index_pipeline.settings', mock_settings):
-        # Import locally to avoid import issues
-        from pipelines.index_pipeline import create_index_pipeline
-        
-        # Create the pipeline
-        pipeline = create_index_pipeline(
-            document_store=mock_es_store,
-            qdrant_store=mock_qdrant_store
-        )
-        
-        # Verify MySQL writers were created 
-        assert mock_mysql_source_writer_class.called, "MySQLSourceDocumentWriter constructor not called"
-        assert mock_mysql_document_writer_class.called, "MySQLDocumentWriter constructor not called"
-        
-        # Check that each MySQL writer was added as a component to the pipeline
-        for call in mock_pipeline.add_component.call_args_list:
-            args = call[0]
-            if len(args) >= 1:
-                component_name = args[0]
-                if component_name == "mysql_source_writer":
-                    assert args[1] == mock_mysql_source_writer
-                elif component_name == "mysql_document_writer":
-                    assert args[1] == mock_mysql_document_writer
-        
-        # Verify the MySQL writers were created with the correct parameters
-        # This check is safer in case call_args is None
-        if mock_mysql_source_writer_class.call_args and len(mock_mysql_source_writer_class.call_args) >= 2:
-            kwargs = mock_mysql_source_writer_class.call_args[1]
-            assert kwargs.get("host") == "test-mysql-host"
-            assert kwargs.get("user") == "test-user"
-            assert kwargs.get("password") == "test-password"
-            assert kwargs.get("database") == "test-db"
-            assert kwargs.get("port") == 3307
-        
-        if mock_mysql_document_writer_class.call_args and len(mock_mysql_document_writer_class.call_args) >= 2:
-            kwargs = mock_mysql_document_writer_class.call_args[1]
-            assert kwargs.get("host") == "test-mysql-host"
-            assert kwargs.get("user") == "test-user"
-            assert kwargs.get("password") == "test-password"
-            assert kwargs.get("database") == "test-db"
-            assert kwargs.get("port") == 3307 
\ No newline at end of file
+    if mocks.mysql_document_writer_class.call_args and len(mocks.mysql_document_writer_class.call_args) >= 2:
+        kwargs = mocks.mysql_document_writer_class.call_args[1]
+        assert kwargs.get("host") == "test-mysql-host"
+        assert kwargs.get("user") == "test-user"
+        assert kwargs.get("password") == "test-password"
+        assert kwargs.get("database") == "test-db"
+        assert kwargs.get("port") == 3307 
\ No newline at end of file
@@ -0,0 +1,83 @@
+import pytest
+import importlib.util
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pipelines.query_pipeline import create_query_pipeline, resolve_ollama_model, OLLAMA_QUANT_BASES, _QUANT_SUFFIX
+
+PULL_MODELS_SCRIPT = Path(__file__).resolve().parents[3] / "scripts" / "build-helpers" / "pull-models.py"
+
+# Components and stores replaced in pipelines.query_pipeline so no model or
+# service is needed to build the pipeline
+PATCHED = [
+    "Pipeline",
+    "ElasticsearchBM25Retriever",
+    "SentenceTransformersTextEmbedder",
+    "QdrantEmbeddingRetriever",
+    "DocumentJoiner",
+    "FastPromptBuilder",
+    "VLLMGenerator",
+    "OllamaGenerator",
+    "AnswerBuilder",
+    "initialize_document_store",
+    "get_qdrant_store",
+    "patch_pipeline_components",
+]
+
+@pytest.fixture
+def mocks():
+    with ExitStack() as stack:
+        yield SimpleNamespace(**{
+            name: stack.enter_context(patch(f"pipelines.query_pipeline.{name}"))
+            for name in PATCHED
+        })
+
+@pytest.mark.parametrize("generator, url", [
+    ("vllm", "http://vllm:8000"),
+    ("llamacpp", "http://llamacpp:8080"),
+])
+def test_openai_compatible_generator_translates_num_predict(monkeypatch, mocks, generator, url):
+    monkeypatch.setattr("pipelines.query_pipeline.settings", SimpleNamespace(
+        embedding_model="test-embedder",
+        default_model="test-model",
+        generator=generator,
+        vllm_api_url="http://vllm:8000",
+        llamacpp_api_url="http://llamacpp:8080",
+        generation_kwargs={"temperature": 0.7, "num_predict": 256},
+    ))
+
+    create_query_pipeline()
+
+    # Ollama's num_predict is sent as max_tokens to the completions API
+    mocks.VLLMGenerator.assert_called_once_with(
+        model="test-model",
+        url=url,
+        generation_kwargs={"temperature": 0.7, "max_tokens": 256}
+    )
+    mocks.OllamaGenerator.assert_not_called()
+
+@pytest.mark.parametrize("model, quant, expected", [
+    ("deepseek-r1:7b", "q4_K_M", "deepseek-r1:7b-qwen-distill-q4_K_M"),
+    ("deepseek-r1:1.5b", "q8_0", "deepseek-r1:1.5b-qwen-distill-q8_0"),
+    # An existing quantization is replaced rather than appended to
+    ("deepseek-r1:7b-qwen-distill-q8_0", "q4_K_M", "deepseek-r1:7b-qwen-distill-q4_K_M"),
+    ("deepseek-r1:7b-qwen-distill-q4_K_M", "q4_K_M", "deepseek-r1:7b-qwen-distill-q4_K_M"),
+    # Models without a known quantized tag are used unchanged
+    ("llama3:8b", "q4_K_M", "llama3:8b"),
+    # No quantization configured
+    ("deepseek-r1:7b", None, "deepseek-r1:7b"),
+    ("deepseek-r1:7b-qwen-distill-q8_0", None, "deepseek-r1:7b-qwen-distill-q8_0"),
+])
+def test_resolve_ollama_model(model, quant, expected):
+    assert resolve_ollama_model(model, quant) == expected
+
+def test_pull_models_script_resolves_the_same_tags():
+    # The build script can't import the backend, so it keeps its own copy of the tags
+    spec = importlib.util.spec_from_file_location("pull_models", PULL_MODELS_SCRIPT)
+    pull_models = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pull_models)
+
+    assert pull_models.OLLAMA_QUANT_BASES == OLLAMA_QUANT_BASES
+    assert pull_models._QUANT_SUFFIX.pattern == _QUANT_SUFFIX.pattern
@@ -0,0 +1,31 @@
+import pytest
+from haystack.dataclasses import Document
+
+from query.prompt_builder import FastPromptBuilder, PROMPT_HEADER
+
+@pytest.fixture(scope="module")
+def documents():
+    return [
+        Document(content="first content"),
+        # Braces in the content must not be treated as format fields
+        Document(content="second {content}"),
+        Document(content=None),
+    ]
+
+def test_run_fast_path_matches_fallback(documents):
+    # top_k equal to the document count takes the specialized template,
+    # any other top_k joins the contents
+    fast = FastPromptBuilder(top_k=len(documents)).run(documents=documents, query="test query")
+    fallback = FastPromptBuilder(top_k=len(documents) + 1).run(documents=documents, query="test query")
+
+    assert fast == fallback
+    assert fast["prompt"] == (
+        PROMPT_HEADER
+        + "first content\nsecond {content}\n"
+        + "\nQuestion: test query\nAnswer:"
+    )
+
+def test_run_without_documents():
+    result = FastPromptBuilder(top_k=5).run(documents=[], query="test query")
+
+    assert result == {"prompt": PROMPT_HEADER + "\nQuestion: test query\nAnswer:"}
@@ -0,0 +1,58 @@
+import json
+
+import httpx
+import pytest
+
+from query.vllm_generator import VLLMGenerator
+
+COMPLETION = {
+    "model": "served-model",
+    "choices": [{"text": "Test answer", "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 2},
+}
+
+@pytest.fixture
+def received():
+    """Request payloads received by the mocked inference server."""
+    return []
+
+def make_generator(received, status_code=200, **kwargs):
+    """Create a generator whose client is served by an httpx.MockTransport."""
+    def handler(request):
+        received.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(status_code, json=COMPLETION)
+
+    generator = VLLMGenerator(model="test-model", url="http://vllm:8000", **kwargs)
+    generator._client.close()
+    generator._client = httpx.Client(base_url=generator.url, transport=httpx.MockTransport(handler))
+    return generator
+
+def test_run_returns_replies_and_meta(received):
+    generator = make_generator(received)
+
+    result = generator.run(prompt="test prompt")
+
+    assert received == [("/v1/completions", {"model": "test-model", "prompt": "test prompt"})]
+    assert result == {
+        "replies": ["Test answer"],
+        "meta": [{
+            "model": "served-model",
+            "finish_reason": "stop",
+            "usage": COMPLETION["usage"],
+        }],
+    }
+
+def test_run_merges_generation_kwargs(received):
+    generator = make_generator(received, generation_kwargs={"temperature": 0.7, "max_tokens": 100})
+
+    generator.run(prompt="test prompt", generation_kwargs={"max_tokens": 10})
+
+    # Per-call kwargs override the ones set at initialization
+    _, payload = received[0]
+    assert payload == {"model": "test-model", "prompt": "test prompt", "temperature": 0.7, "max_tokens": 10}
+
+def test_run_raises_on_error_status(received):
+    generator = make_generator(received, status_code=500)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        generator.run(prompt="test prompt")
@@ -24,25 +24,19 @@ if __name__ == '__main__':
     print("Note: We're using selective imports and mocking to avoid dependency issues")
     
     try:
-        # Start with the MySQL document writer tests which don't need Haystack imports
-        mysql_writer_result = pytest.main([
+        # Run both suites in a single session; -x stops at the first failure,
+        # so MySQL document writer failures surface before the pipeline tests.
+        # Runs serially because that ordering doesn't hold across xdist workers
+        result = pytest.main([
             'tests/indexing/test_mysql_document_writer.py',
-            '-v'
-        ])
-        
-        if mysql_writer_result != 0:
-            print("MySQL document writer tests failed! Fix these issues first.")
-            sys.exit(mysql_writer_result)
-        
-        # Now run the pipeline tests with heavy mocking
-        pipeline_result = pytest.main([
             'tests/pipelines/test_index_pipeline.py',
-            '-v'
+            '-v',
+            '-x'
         ])
         
-        # Return the combined result
-        if pipeline_result != 0:
-            sys.exit(pipeline_result)
+        if result != 0:
+            print("MySQL tests failed! Fix the MySQL document writer issues first.")
+            sys.exit(result)
             
         print("\n✅ All MySQL tests passed successfully!")
     except Exception as e:
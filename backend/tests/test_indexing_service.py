@@ -1,14 +1,13 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from pathlib import Path
 
-from indexing.service import IndexingService, IndexingConfig
-from haystack_integrations.document_stores.opensearch import OpenSearchDocumentStore
+from indexing.service import IndexingService
 
 
 @pytest.fixture
 def mock_document_store():
-    return Mock(spec=OpenSearchDocumentStore)
+    return Mock()
 
 @pytest.fixture
 def indexing_service(mock_document_store):
@@ -1,22 +1,24 @@
-from fastapi.testclient import TestClient
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from haystack.dataclasses import GeneratedAnswer, Document
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 
 from query.main import app, get_query_service
+from query.service import QueryService
 from common.models import SearchResponse
 
 
-client = TestClient(app)
-
 @pytest.fixture
 def mock_query_service():
-    with patch("query.main.query_service") as mock:
-        yield mock
-
-@pytest.fixture
+    # Inject the mock through the endpoint's dependency; no module patching needed.
+    # The override is removed at teardown, even if the test failed
+    mock = Mock(spec=QueryService)
+    app.dependency_overrides[get_query_service] = lambda: mock
+    yield mock
+    app.dependency_overrides.pop(get_query_service, None)
+
+@pytest.fixture(scope="module")
 def mock_search_response():
     return {
         "answer": "Test answer",
@@ -31,79 +33,62 @@ class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1)
     filters: dict | None = None
 
-# Test successful search
-def test_search_endpoint_success(mock_query_service):
-    app.dependency_overrides[get_query_service] = lambda: mock_query_service
-    mock_query_service.search.return_value = GeneratedAnswer(
-        query="test query",
-        data="Test answer",
-        documents=[
-            Document(
-                content="test content",
-                id="doc1",
-                meta={"split_idx_start": "0", "file_path": "test.txt"}
-            )
-        ]
-    )
-
-    response = client.post(
-        "/search",
-        json={"query": "test query", "filters": {"language": "python"}}
-    )
-
-    assert response.status_code == 200
-    assert "results" in response.json()
-    mock_query_service.search.assert_called_once_with("test query", {"language": "python"})
-    app.dependency_overrides.clear()
-
-# Test input validation
-def test_search_endpoint_empty_query(mock_query_service):
-    """Test that empty queries are rejected"""
-    app.dependency_overrides[get_query_service] = lambda: mock_query_service
-
-    response = client.post(
-        "/search",
-        json={"query": "", "filters": None}
-    )
+SEARCH_ANSWER = GeneratedAnswer(
+    query="test query",
+    data="Test answer",
+    documents=[
+        Document(
+            content="test content",
+            id="doc1",
+            meta={"split_idx_start": "0", "file_path": "test.txt"}
+        )
+    ]
+)
 
-    # The current implementation returns 500 for empty queries
-    assert response.status_code == 500
-    assert "validation error" in response.json()["detail"].lower()
-
-    app.dependency_overrides.clear()
-
-# Test missing required field
-def test_search_endpoint_missing_query(mock_query_service):
-    """Test that query is required"""
-    app.dependency_overrides[get_query_service] = lambda: mock_query_service
-
-    response = client.post(
-        "/search",
-        json={"filters": None}
-    )
-
-    assert response.status_code == 422
-    validation_error = response.json()["detail"][0]
-    assert validation_error["type"] == "missing"
-    assert validation_error["loc"] == ["body", "query"]
-
-    mock_query_service.search.assert_not_called()
-    app.dependency_overrides.clear()
-
-# Test service error handling
-def test_search_endpoint_service_error(mock_query_service):
-    app.dependency_overrides[get_query_service] = lambda: mock_query_service
-    mock_query_service.search.side_effect = Exception("Search service error")
-
-    response = client.post("/search", json={"query": "test query", "filters": None})
-
-    assert response.status_code == 500
-    assert "Search service error" in response.json()["detail"]
-    app.dependency_overrides.clear()
+@pytest.fixture
+def search_service(request, mock_query_service):
+    """Serve mock_query_service whose search returns, or raises, request.param."""
+    if isinstance(request.param, Exception):
+        mock_query_service.search.side_effect = request.param
+    else:
+        mock_query_service.search.return_value = request.param
+    return mock_query_service
+
+# `called` is True when search must be called with the payload and False when
+# it must not be called
+@pytest.mark.parametrize("search_service, payload, status, detail, called", [
+    # Successful search
+    (SEARCH_ANSWER, {"query": "test query", "filters": {"language": "python"}}, 200, None, True),
+    # Empty queries are not rejected; they are passed through to the service
+    (SEARCH_ANSWER, {"query": "", "filters": None}, 200, None, True),
+    # Query is required
+    (SEARCH_ANSWER, {"filters": None}, 422, None, False),
+    # Service error handling
+    (Exception("Search service error"), {"query": "test query", "filters": None}, 500, "Search service error", True),
+], indirect=["search_service"], ids=["success", "empty_query", "missing_query", "service_error"])
+def test_search_endpoint(query_client, search_service, payload, status, detail, called):
+    response = query_client.post("/search", json=payload)
+
+    assert response.status_code == status
+    if status == 200:
+        assert "results" in response.json()
+    elif status == 422:
+        validation_error = response.json()["detail"][0]
+        assert validation_error["type"] == "missing"
+        assert validation_error["loc"] == ["body", "query"]
+    if detail is not None:
+        assert detail.lower() in response.json()["detail"].lower()
+
+    if called:
+        search_service.search.assert_called_once_with(
+            query=payload["query"], filters=payload["filters"], model=None
+        )
+    else:
+        search_service.search.assert_not_called()
 
 # Test invalid JSON
-def test_search_endpoint_invalid_json():
-    response = client.post(
+def test_search_endpoint_invalid_json(query_client):
+    response = query_client.post(
         "/search",
         data="invalid json",
         headers={"Content-Type": "application/json"}
@@ -112,15 +97,15 @@ def test_search_endpoint_invalid_json():
     assert response.status_code == 422
 
 # Test health check endpoint
-def test_health_check():
-    response = client.get("/health")
+def test_health_check(query_client):
+    response = query_client.get("/health")
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
 # Test root endpoint
-def test_root():
-    response = client.get("/")
+def test_root(query_client):
+    response = query_client.get("/")
 
     assert response.status_code == 200
     assert "message" in response.json()
@@ -1,4 +1,6 @@
 import pytest
+import httpx
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 from haystack.dataclasses import Document, GeneratedAnswer
 
@@ -6,7 +8,16 @@ from query.service import QueryService, QueryConfig
 from haystack_integrations.document_stores.opensearch import OpenSearchDocumentStore
 
 
-@pytest.fixture
+def expected_pipeline_input(query):
+    """Input QueryService.search is expected to pass to the query pipeline."""
+    return {
+        "bm25_retriever": {"query": query},
+        "query_embedder": {"text": query},
+        "answer_builder": {"query": query},
+        "prompt_builder": {"query": query}
+    }
+
+@pytest.fixture(scope="module")
 def mock_document_store():
     return Mock(spec=OpenSearchDocumentStore)
 
@@ -14,6 +25,12 @@ def mock_document_store():
 def query_service(mock_document_store):
     return QueryService(document_store=mock_document_store)
 
+@pytest.fixture(scope="session")
+def built_query_service():
+    # Building the pipeline is expensive; share one service across tests that only
+    # inspect it. Tests that swap the pipeline use the query_service fixture.
+    return QueryService(document_store=Mock(spec=OpenSearchDocumentStore))
+
 def test_search(query_service):
     # Mock the pipeline
     mock_pipeline = Mock()
@@ -36,18 +53,13 @@ def test_search(query_service):
     result = query_service.search("test query", {"filter": "value"})
     
     # Verify
-    mock_pipeline.run.assert_called_once_with({
-        "bm25_retriever": {"query": "test query", "filters": {"filter": "value"}},
-        "query_embedder": {"text": "test query"},
-        "answer_builder": {"query": "test query"},
-        "prompt_builder": {"query": "test query"}
-    })
+    mock_pipeline.run.assert_called_once_with(expected_pipeline_input("test query"))
     assert isinstance(result, GeneratedAnswer)
     assert result.data == "Test answer"
     assert len(result.documents) == 1
 
-def test_query_pipeline_creation(mock_document_store):
-    service = QueryService(document_store=mock_document_store)
+def test_query_pipeline_creation(built_query_service):
+    service = built_query_service
     assert service.pipeline is not None
     # Check if specific components exist using get_component
     assert service.pipeline.get_component("bm25_retriever") is not None
@@ -81,6 +93,43 @@ def test_search_with_no_results(query_service):
     query_service.pipeline = mock_pipeline
 
     result = query_service.search("nonexistent query")
+    mock_pipeline.run.assert_called_once_with(expected_pipeline_input("nonexistent query"))
     assert isinstance(result, GeneratedAnswer)
     assert result.data == "No relevant information found"
-    assert len(result.documents) == 0
\ No newline at end of file
+    assert len(result.documents) == 0
+
+@pytest.fixture
+def ollama_settings(monkeypatch):
+    settings = SimpleNamespace(
+        generator="ollama",
+        default_model="deepseek-r1:7b",
+        ollama_quant=None,
+        ollama_api_url="http://ollama:11434"
+    )
+    monkeypatch.setattr("query.service.settings", settings)
+    return settings
+
+@patch("query.service.httpx.post")
+def test_warm_up_preloads_ollama_model(mock_post, query_service, ollama_settings):
+    query_service.pipeline = Mock()
+
+    query_service.warm_up()
+
+    query_service.pipeline.warm_up.assert_called_once()
+    mock_post.assert_called_once_with(
+        "http://ollama:11434/api/generate",
+        json={"model": "deepseek-r1:7b", "prompt": ""},
+        timeout=300
+    )
+    mock_post.return_value.raise_for_status.assert_called_once()
+
+@patch("query.service.httpx.post", side_effect=httpx.ConnectError("connection refused"))
+def test_warm_up_logs_ollama_errors(mock_post, query_service, ollama_settings, caplog):
+    query_service.pipeline = Mock()
+
+    # A failed preload must not abort startup
+    query_service.warm_up()
+
+    mock_post.assert_called_once()
+    assert "Failed to preload Ollama model deepseek-r1:7b" in caplog.text
+
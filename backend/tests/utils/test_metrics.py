@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from utils import metrics
+from utils.metrics import MetricsMiddleware, instrument_fastapi_with_metrics
+
+def create_app():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.post("/items")
+    async def create_item():
+        return JSONResponse({"id": 1}, status_code=201)
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+@pytest.fixture
+def registry():
+    # A private registry keeps the metrics independent of the process-wide ones
+    return CollectorRegistry()
+
+@pytest.fixture
+def client(registry):
+    app = create_app()
+    app.add_middleware(
+        MetricsMiddleware,
+        request_counter=Counter(
+            "test_requests_total", "Requests", ["method", "path", "status_code"], registry=registry
+        ),
+        latency_histogram=Histogram(
+            "test_request_duration_seconds", "Latency", ["method", "path"], registry=registry
+        )
+    )
+    with TestClient(app, raise_server_exceptions=False) as c:
+        yield c
+
+def request_count(registry, method, path, status_code):
+    return registry.get_sample_value(
+        "test_requests_total", {"method": method, "path": path, "status_code": status_code}
+    )
+
+def test_requests_are_labelled_with_the_route_template(client, registry):
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert request_count(registry, "GET", "/items/{item_id}", "200") == 2
+    assert registry.get_sample_value(
+        "test_request_duration_seconds_count", {"method": "GET", "path": "/items/{item_id}"}
+    ) == 2
+
+def test_status_code_comes_from_the_response(client, registry):
+    response = client.post("/items")
+
+    assert response.status_code == 201
+    assert request_count(registry, "POST", "/items", "201") == 1
+
+def test_unmatched_path_is_labelled_none(client, registry):
+    client.get("/missing")
+
+    assert request_count(registry, "GET", "none", "404") == 1
+
+def test_exception_is_recorded_as_500(client, registry):
+    # The exception escapes before any response is started
+    response = client.get("/fail")
+
+    assert response.status_code == 500
+    assert request_count(registry, "GET", "/fail", "500") == 1
+
+def test_metrics_endpoint_exposes_request_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "_METRICS_ENABLED", True)
+    app = create_app()
+    instrument_fastapi_with_metrics(app, "test_service")
+
+    with TestClient(app) as client:
+        client.get("/items/1")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",path="/items/{item_id}",status_code="200"}' in response.text
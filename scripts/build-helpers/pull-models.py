@@ -4,29 +4,153 @@ This script reads the config.yml file and pulls the specified Ollama models.
 It's used during the Docker build process for the Ollama container.
 """
 
+import copy
+import hashlib
+import json
 import os
+import re
 import yaml
 import subprocess
 import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Prefer the libyaml-backed loader; it parses several times faster than the
+# pure-Python SafeLoader and is only missing when PyYAML was built without libyaml
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-def load_config():
-    """Load configuration from the config.yml file."""
-    config_file = "/config.yml"
+# Parsed configs keyed by path, stored with the (mtime, size) they were parsed at
+_CONFIG_CACHE = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+# Quantized Ollama tags of the default models; mirrors OLLAMA_QUANT_BASES in
+# backend/src/pipelines/query_pipeline.py, which this build step can't import
+OLLAMA_QUANT_BASES = {
+    "deepseek-r1:1.5b": "deepseek-r1:1.5b-qwen-distill",
+    "deepseek-r1:7b": "deepseek-r1:7b-qwen-distill",
+}
+_QUANT_SUFFIX = re.compile(r"-(q\d\w*|fp16)$")
+
+
+def _sidecar_paths(config_file):
+    """
+    JSON cache locations for a config file: next to it, then under /tmp.
+    
+    The /tmp name includes a hash of the absolute path, so configs with the
+    same basename in different directories don't share a cache.
+    """
+    path_hash = hashlib.sha1(os.path.abspath(config_file).encode()).hexdigest()[:16]
+    return [
+        config_file + ".json",
+        os.path.join("/tmp", f"{os.path.basename(config_file)}.{path_hash}.json"),
+    ]
+
+
+def _read_sidecar(config_file, config_mtime):
+    """Return the config from a JSON sidecar that is not older than the YAML, or None."""
+    for cache_path in _sidecar_paths(config_file):
+        try:
+            if os.stat(cache_path).st_mtime >= config_mtime:
+                with open(cache_path, 'r') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def _write_sidecar(config_file, config):
+    """Write the parsed config as JSON, falling back to /tmp if the config's directory is read-only."""
+    for cache_path in _sidecar_paths(config_file):
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump(config, f)
+            return
+        except (OSError, TypeError, ValueError):
+            continue
+
+
+def load_config(config_file="/config.yml"):
+    """
+    Load configuration from the config.yml file.
     
-    if not os.path.exists(config_file):
+    The parsed config is cached per path and reused while the file's mtime and
+    size are unchanged. Callers get a deep copy, so they can't modify the cache.
+    Across runs, a JSON copy written next to the file (or under /tmp) is read
+    instead of the YAML as long as it is not older than the YAML.
+    """
+    try:
+        f = open(config_file, 'r')
+    except FileNotFoundError:
         print(f"Error: Config file {config_file} not found.")
         sys.exit(1)
     
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-            return config
+        with f:
+            # Stat the already-open file rather than the path
+            st = os.fstat(f.fileno())
+            cached = _CONFIG_CACHE.get(config_file)
+            if cached is not None and cached[:2] == (st.st_mtime, st.st_size):
+                _CONFIG_CACHE.move_to_end(config_file)
+                return copy.deepcopy(cached[2])
+            
+            config = _read_sidecar(config_file, st.st_mtime)
+            if config is None:
+                config = yaml.load(f, Loader=_YamlLoader)
+                _write_sidecar(config_file, config)
+        
+        _CONFIG_CACHE[config_file] = (st.st_mtime, st.st_size, config)
+        _CONFIG_CACHE.move_to_end(config_file)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+            _CONFIG_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
     except Exception as e:
         print(f"Error loading config file: {e}")
         sys.exit(1)
 
 
+def resolve_model(model, quant):
+    """Return the Ollama tag of a model at the given quantization, or the model itself if it has none."""
+    if not quant:
+        return model
+    base = _QUANT_SUFFIX.sub("", model)
+    base = OLLAMA_QUANT_BASES.get(base, base)
+    if base not in OLLAMA_QUANT_BASES.values():
+        print(f"No known quantized tag for model {model}; pulling it unchanged")
+        return model
+    return f"{base}-{quant}"
+
+
+def list_local_models():
+    """Return the names of models already pulled, or an empty set if `ollama list` fails."""
+    try:
+        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, check=False)
+        # The first line is the NAME/ID/SIZE/MODIFIED header
+        return {line.split()[0] for line in result.stdout.splitlines()[1:] if line.strip()}
+    except Exception as e:
+        print(f"Could not list local models: {e}")
+        return set()
+
+
+def pull_model(model):
+    """
+    Pull a single model.
+    
+    Progress output is discarded and only stderr is kept for error reporting,
+    so concurrent pulls don't compete for the terminal.
+    
+    Returns:
+        A (returncode, seconds, stderr) tuple
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(["ollama", "pull", model], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, err = process.communicate()
+    return process.returncode, time.perf_counter() - start, err.decode(errors="replace")
+
+
 def pull_models(config):
     """Pull Ollama models specified in the config."""
     if not config or 'llm' not in config or 'ollama_models' not in config['llm']:
@@ -43,16 +167,44 @@ def pull_models(config):
             print("Invalid model specification in config.yml. Using default models.")
             models = ["deepseek-r1:1.5b", "deepseek-r1:7b"]
     
+    # Pull the same tags the query service lists in /available-models
+    llm = (config or {}).get('llm') or {}
+    if llm.get('default_model'):
+        models = [llm['default_model'], *models]
+    models = list(dict.fromkeys(resolve_model(model, llm.get('ollama_quant')) for model in models))
+    
     print(f"Models to pull: {models}")
     
+    # Skip models that are already present; ollama lists untagged models as name:latest
+    present = list_local_models()
+    to_pull = []
     for model in models:
-        print(f"Pulling model: {model}")
-        try:
-            subprocess.run(["ollama", "pull", model], check=True)
-            print(f"Successfully pulled model: {model}")
-        except subprocess.CalledProcessError as e:
-            print(f"Error pulling model {model}: {e}")
-            # Continue with other models even if one fails
+        if model in present or (":" not in model and f"{model}:latest" in present):
+            print(f"Model already present, skipping: {model}")
+        else:
+            to_pull.append(model)
+    models = to_pull
+    
+    # Pulls are network and disk bound, so run them concurrently
+    parallelism = int(os.environ.get("OLLAMA_PULL_PARALLELISM", "4"))
+    with ThreadPoolExecutor(max_workers=max(1, min(len(models), parallelism))) as executor:
+        futures = {}
+        for model in models:
+            print(f"Pulling model: {model}")
+            futures[executor.submit(pull_model, model)] = model
+        
+        for future in as_completed(futures):
+            model = futures[future]
+            # Report failures and continue with other models even if one fails
+            try:
+                returncode, duration, err = future.result()
+            except OSError as e:
+                print(f"Error pulling model {model}: {e}")
+                continue
+            if returncode:
+                print(f"Error pulling model {model} (exit code {returncode}): {err.strip()[-200:]}")
+            else:
+                print(f"Successfully pulled model: {model} in {duration:.1f}s")
     
     print("Model pulling complete.")
 